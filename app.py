@@ -1,20 +1,39 @@
 import os
-import shutil
+import glob
+import asyncio
+import json
+import hashlib
+import tempfile
+import time
+import uuid
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, UploadFile, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse, Response
 from fastapi.staticfiles import StaticFiles
-from typing import Optional
-from elevenlabs.client import ElevenLabs
+from functools import lru_cache
+from contextlib import closing
+from typing import Optional, Dict, Any, AsyncIterator, Iterator, List
 import io
 import logging
+from urllib.parse import quote
 from starlette.background import BackgroundTask
-import io
-from src.llms.groqllm import GroqLLM
+from starlette.concurrency import run_in_threadpool
 from src.graphs.graph_builder import GraphBuilder
+from src.providers.clients import get_llm, get_stt_client, get_tts_client, get_audio_segment
+from src.cache.shared_store import get_shared_store
+from src.cache.transcript_cache import get_transcript_cache
+from src.cache.translation_memory import get_translation_memory
+from src.admission.lanes import ADMISSION_QUEUE_TIMEOUT, LANES, Lane, LaneFull, lane_for
+from src.storage.artifact_store import etag, etag_matches, get_artifact_store, negotiate_encoding
 from src.states.blogstate import Language, validate_audio_path
+from src.nodes.sections import join_sections, split_sections
+from src.nodes.blog_node import SEGMENT_TAG
+from src.nodes.cancellation import Cancelled, CancelToken, cancel_config, iter_cancellable
+from src.monitoring.metrics import (
+    REQUEST_LATENCY, ERRORS, processing_summary, record_tts_characters, render_latest, track_provider
+)
 
 # Load environment variables
 load_dotenv()
@@ -23,8 +42,15 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize ElevenLabs client
-ELEVENLABS_CLIENT = ElevenLabs(api_key=os.getenv("ELEVENLABS_API_KEY"))
+# Read size when streaming voice uploads to disk
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Seconds a request's generation and synthesis may take before they are cancelled; 0 disables
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE") or 180)
+# How often in-flight requests check whether their client is still connected
+DISCONNECT_POLL_INTERVAL = 0.5
+# How often a request for audio another request is synthesizing checks whether it is done
+AUDIO_WAIT_INTERVAL = 0.5
 
 # Voice mapping for different languages
 VOICE_MAPPING = {
@@ -35,6 +61,22 @@ VOICE_MAPPING = {
     "german": "Elli"
 }
 
+# ElevenLabs voice IDs per language
+VOICE_IDS = {
+    "english": "EXAVITQu4vr4xnSDxMaL",  # Rachel
+    "hindi": "AZnzlk1XvdvUeBnXmlld",    # Domi
+    "french": "XB0fDUnXU5powFXDhCwa",    # Bella
+    "spanish": "ErXwobaYiN019PkySvjV",   # Antoni
+    "german": "MF3mGyEYCl7XYWbV9V6O"     # Elli
+}
+DEFAULT_VOICE_ID = VOICE_IDS["english"]
+
+# Accepted values of the /blogs input_type and output_type form fields
+MEDIA_TYPES = ("text", "voice")
+
+# Per-client request budget shared by all workers; 0 disables the limit
+RATE_LIMIT_PER_MINUTE = int(os.getenv("RATE_LIMIT_PER_MINUTE") or 0)
+
 # App initialization
 app = FastAPI()
 
@@ -48,16 +90,281 @@ app.add_middleware(
 )
 
 # Serve static files
+# Nothing in a fresh checkout creates the directory, and StaticFiles requires it
+os.makedirs("static", exist_ok=True)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 def cleanup_temp_file(path: str):
-    """Helper function to clean up temporary files"""
-    if path and os.path.exists(path):
-        try:
-            os.remove(path)
-            logger.info(f"Removed temporary file: {path}")
-        except Exception as e:
-            logger.error(f"Failed to remove temporary file {path}: {str(e)}")
+    """Helper function to clean up temporary files and the STT copies derived from them"""
+    if not path:
+        return
+    for candidate in [path] + glob.glob(f"{glob.escape(path)}.stt.*"):
+        if os.path.exists(candidate):
+            try:
+                os.remove(candidate)
+                logger.info(f"Removed temporary file: {candidate}")
+            except Exception as e:
+                logger.error(f"Failed to remove temporary file {candidate}: {str(e)}")
+
+def synthesize_speech(content: str, language: str, token: Optional[CancelToken] = None) -> Iterator[bytes]:
+    """Stream MP3 chunks for the content from ElevenLabs as they are produced"""
+    voice_id = VOICE_IDS.get(language, DEFAULT_VOICE_ID)
+    logger.info(f"Generating voice output with voice ID: {voice_id}")
+    record_tts_characters("elevenlabs", content)
+    with track_provider("elevenlabs", "tts_stream"):
+        audio_generator = get_tts_client().text_to_speech.convert(
+            text=content,
+            voice_id=voice_id,
+            model_id="eleven_monolingual_v1",
+            output_format="mp3_44100_128"
+        )
+        # Cancelling closes the ElevenLabs stream, so synthesis stops upstream too
+        with closing(iter_cancellable(audio_generator, token)) as chunks:
+            for chunk in chunks:
+                yield chunk
+
+def store_blog(fields: Dict[str, Any], title: str, source_sections: List[str], sections: List[str],
+               reuse_audio: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Write a blog's artifacts and record. Draft and published sections are kept
+    as separate blobs so a revision can regenerate one section and reuse the
+    rest; `reuse_audio` maps section sha256 -> stored audio of an earlier version.
+    """
+    store = get_artifact_store()
+    reuse_audio = reuse_audio or {}
+    content = join_sections(sections)
+    section_refs = []
+    for section in sections:
+        ref = store.put_blob(section.encode("utf-8"))
+        section_refs.append({"content": ref, "audio": reuse_audio.get(ref["sha256"])})
+    record = {
+        **fields,
+        "title": title,
+        "markdown": store.put_blob(f"# {title}\n\n{content}\n".encode("utf-8"), compress=True),
+        "content": store.put_blob(content.encode("utf-8")),
+        "source_sections": [store.put_blob(section.encode("utf-8")) for section in source_sections],
+        "sections": section_refs,
+        "audio": None,
+    }
+    store.save_blog(record)
+    return record
+
+def persist_blog(request_info: Dict[str, Any], result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Store a finished blog as artifacts so it can be fetched again without regenerating it"""
+    blog = result.get("blog") or {}
+    title, content = blog.get("title", ""), blog.get("content", "")
+    if not content:
+        return None
+    summary = processing_summary(result)
+    try:
+        fields = {
+            **request_info,
+            "topic": result.get("topic", ""),
+            "translate": any(step.endswith("_translation") for step in summary["processing_steps"]),
+            "metrics": summary,
+        }
+        source = result.get("source_content") or content
+        return store_blog(fields, title, split_sections(source), split_sections(content))
+    except Exception as e:
+        logger.error(f"Could not store blog artifacts: {e}")
+        ERRORS.labels(component="artifact_store").inc()
+        return None
+
+def read_sections(refs: List[Dict[str, Any]]) -> List[str]:
+    store = get_artifact_store()
+    return [store.read_blob(ref["sha256"]).decode("utf-8") for ref in refs]
+
+def blog_links(record: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Response fields pointing at a stored blog"""
+    if record is None:
+        return {}
+    links = {"id": record["id"], "url": f"/blogs/{record['id']}"}
+    if record["output_type"] == "voice":
+        links["audio_url"] = f"/blogs/{record['id']}/audio"
+    return links
+
+def synthesize_and_store(record: Dict[str, Any], token: Optional[CancelToken] = None) -> Iterator[bytes]:
+    """
+    Stream speech for a stored blog section by section. Sections that already
+    have audio (e.g. left untouched by a revision) are replayed from disk; new
+    audio is kept so replays and downloads don't synthesize again. Audio is
+    written to the store as it streams, never joined in memory.
+    """
+    store = get_artifact_store()
+    # Records stored before per-section artifacts have a single section
+    sections = record.get("sections") or [{"content": record["content"], "audio": None}]
+    with store.open_blob() as full_audio:
+        for section in sections:
+            if section.get("audio"):
+                audio = store.read_blob(section["audio"]["sha256"])
+                full_audio.write(audio)
+                yield audio
+                continue
+            text = store.read_blob(section["content"]["sha256"]).decode("utf-8")
+            with store.open_blob() as section_audio:
+                for chunk in synthesize_speech(text, record["language"], token):
+                    section_audio.write(chunk)
+                    full_audio.write(chunk)
+                    yield chunk
+                section["audio"] = section_audio.commit()
+            # Keep each finished section, so a cancelled synthesis resumes after it
+            store.update_blog(record["id"], sections=sections)
+        store.update_blog(record["id"], sections=sections, audio=full_audio.commit())
+
+def claim_audio(blog_id: str, owner: str) -> bool:
+    """
+    Take the host-wide right to synthesize a blog's audio, so concurrent plays
+    and downloads don't each pay for synthesis and overwrite each other's
+    record updates. The claim outlives any request deadline only by a margin.
+    """
+    return get_shared_store().claim(f"audio:{blog_id}", owner.encode(), (REQUEST_DEADLINE or 3600) + 60)
+
+def release_audio(blog_id: str, owner: str):
+    get_shared_store().release(f"audio:{blog_id}", owner.encode())
+
+def stream_audio(record: Optional[Dict[str, Any]], content: str, language: str,
+                 token: CancelToken, claim: Optional[str] = None) -> Iterator[bytes]:
+    """
+    MP3 response body: the stored blog's audio if there is a record, else plain
+    synthesis. `claim` is the owner of the record's synthesis claim, released
+    when the body ends.
+    """
+    try:
+        if record:
+            yield from synthesize_and_store(record, token)
+        else:
+            yield from synthesize_speech(content, language, token)
+    except Cancelled as e:
+        # Nothing more can be sent mid-body; end the stream
+        logger.warning(f"Audio stream stopped: {e}")
+    except Exception as e:
+        logger.error(f"Streaming error: {str(e)}")
+        raise
+    finally:
+        if claim:
+            release_audio(record["id"], claim)
+
+def serve_artifact(request: Request, artifact: Dict[str, Any], media_type: str) -> Response:
+    """Serve a stored blob from disk, precompressed if the client accepts it, honouring If-None-Match"""
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), artifact.get("encodings", []))
+    headers = {
+        "ETag": etag(artifact, encoding),
+        # Blobs are content-addressed and blog ids are never reused, so a fetched copy stays valid
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request.headers.get("if-none-match"), artifact):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    path = get_artifact_store().blob_path(artifact["sha256"], encoding)
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+@lru_cache(maxsize=None)
+def get_graph(usecase: str):
+    """Compiled workflow per use case, built once per process and reused by every request"""
+    return GraphBuilder(get_llm()).setup_graph(usecase)
+
+def preload(voice: bool = True):
+    """
+    Build everything requests need up front. serve.py calls this in the master
+    process before forking so workers inherit it instead of building it on their
+    first request. No network connections are opened here.
+    """
+    start = time.perf_counter()
+    for usecase in ("topic", "language", "voice", "revision"):
+        get_graph(usecase)
+    get_shared_store()
+    get_transcript_cache()
+    get_translation_memory()
+    get_artifact_store()
+    if voice:
+        get_stt_client()
+        get_tts_client()
+        get_audio_segment()
+    logger.info(f"Preloaded graphs and provider clients in {time.perf_counter() - start:.2f}s")
+
+def check_rate_limit(request: Request) -> Optional[JSONResponse]:
+    """429 response when the client exceeded RATE_LIMIT_PER_MINUTE, counted across workers"""
+    if not RATE_LIMIT_PER_MINUTE:
+        return None
+    client = request.client.host if request.client else "unknown"
+    if get_shared_store().hit(f"rate:{client}", 60) <= RATE_LIMIT_PER_MINUTE:
+        return None
+    retry_after = int(60 - time.time() % 60) + 1
+    return JSONResponse(
+        {"error": "Rate limit exceeded"}, status_code=429, headers={"Retry-After": str(retry_after)}
+    )
+
+def ndjson_event(event_type: str, **fields) -> bytes:
+    return (json.dumps({"type": event_type, **fields}, ensure_ascii=False) + "\n").encode("utf-8")
+
+def is_content_node(node: str) -> bool:
+    return node == "content_generation" or node.endswith("_translation")
+
+def stream_blog_events(graph, state: Dict[str, Any], request_info: Dict[str, Any], token: CancelToken,
+                       temp_path: Optional[str]) -> Iterator[bytes]:
+    """
+    Run the graph and emit newline-delimited JSON events as work completes:
+    `transcript`/`title` when those nodes finish, `token` for every LLM token of
+    the content and translation nodes, then `done` with the final blog and its
+    stored `id`/`url` (plus an `audio_url` for voice output) or `error`.
+    """
+    language = request_info["language"]
+    final_state = dict(state)
+    try:
+        yield ndjson_event("started", language=language)
+        for mode, payload in graph.stream(state, cancel_config(token), stream_mode=["updates", "messages", "values"]):
+            if mode == "messages":
+                chunk, metadata = payload
+                node = metadata.get("langgraph_node", "")
+                # Segment-translation replies are marker lists; the `content` event carries the result
+                if is_content_node(node) and chunk.content and SEGMENT_TAG not in metadata.get("tags", []):
+                    yield ndjson_event("token", node=node, text=chunk.content)
+            elif mode == "updates":
+                for node, update in payload.items():
+                    update = update or {}
+                    if node == "voice_input" and update.get("voice_transcript"):
+                        yield ndjson_event("transcript", text=update["voice_transcript"])
+                    elif node == "title_creation" and update.get("blog"):
+                        yield ndjson_event("title", text=update["blog"].get("title", ""))
+                    elif is_content_node(node) and update.get("blog"):
+                        yield ndjson_event("content", node=node, text=update["blog"].get("content", ""))
+            else:
+                final_state = payload
+
+        blog = final_state.get("blog") or {}
+        done = {
+            "title": blog.get("title", ""),
+            "content": blog.get("content", ""),
+            "language": language,
+            "metrics": processing_summary(final_state),
+            **blog_links(persist_blog(request_info, final_state))
+        }
+        yield ndjson_event("done", **done)
+    except Cancelled as e:
+        logger.warning(f"Streaming generation stopped: {e}")
+        if e.reason == "deadline":
+            yield ndjson_event("error", error="Request deadline exceeded")
+    except Exception as e:
+        logger.error(f"Streaming generation failed: {str(e)}", exc_info=True)
+        ERRORS.labels(component="request").inc()
+        yield ndjson_event("error", error="Processing failed", details=str(e))
+    finally:
+        cleanup_temp_file(temp_path)
+
+def observe_request(start: float, input_type: str, output_type: str, response: Response) -> Response:
+    """Record request latency (until the response starts) and pass the response through"""
+    REQUEST_LATENCY.labels(
+        input_type=input_type, output_type=output_type, status=str(response.status_code)
+    ).observe(time.perf_counter() - start)
+    return response
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint"""
+    payload, content_type = render_latest()
+    return Response(payload, media_type=content_type)
 
 @app.post("/blogs")
 async def create_blogs(
@@ -68,12 +375,119 @@ async def create_blogs(
     voice_input: Optional[UploadFile] = None,
     language: str = Form("english"),
     tone: str = Form("professional"),
-    length: int = Form(500)
+    length: int = Form(500),
+    stream: bool = Form(False)
 ):
     """
     Handles both text and voice input with text/voice output options
     with improved ElevenLabs streaming implementation
     """
+    start = time.perf_counter()
+    # Checked before anything is recorded: these values become metric labels
+    if input_type not in MEDIA_TYPES or output_type not in MEDIA_TYPES:
+        return observe_request(start, "invalid", "invalid", JSONResponse(
+            {"error": f"input_type and output_type must be one of {list(MEDIA_TYPES)}"}, status_code=400
+        ))
+    token = CancelToken(REQUEST_DEADLINE)
+    # SharedStore.hit can wait up to its SQLite busy timeout for another worker's lock
+    limited = await run_in_threadpool(check_rate_limit, request)
+    if limited:
+        return observe_request(start, input_type, output_type, limited)
+
+    # Admission control: each workload class has its own slots and queue, so a burst
+    # of voice requests cannot starve cheap text requests on this worker
+    lane = lane_for(input_type, output_type)
+    try:
+        acquired = await lane.acquire()
+    except LaneFull as e:
+        logger.warning(f"Rejected /blogs request: {e}")
+        return observe_request(start, input_type, output_type, busy_response(e))
+
+    try:
+        response = await generate_blog(
+            request, token, input_type, output_type, text_input, voice_input, language, tone, length, stream, lane.name
+        )
+    except BaseException:
+        lane.release(acquired)
+        raise
+    response = cancel_with_request(response, request, token)
+    return observe_request(start, input_type, output_type, release_after(response, lane, acquired))
+
+def busy_response(e: LaneFull) -> JSONResponse:
+    """Fast rejection telling the client when its lane should have room again"""
+    status_code = 429 if e.reason == "queue_full" else 503
+    return JSONResponse(
+        {"error": "Server busy, retry later", "lane": e.lane},
+        status_code=status_code,
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+def cancelled_response(e: Cancelled) -> JSONResponse:
+    if e.reason == "deadline":
+        return JSONResponse({"error": "Request deadline exceeded"}, status_code=504)
+    # The client is gone; this status only shows up in logs and metrics
+    return JSONResponse({"error": "Client disconnected"}, status_code=499)
+
+async def watch_request(request: Request, token: CancelToken):
+    """Cancel the request's work once its client disconnects or its deadline passes"""
+    while not token.cancelled:
+        if await request.is_disconnected():
+            token.cancel("disconnect")
+            return
+        await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+
+async def run_cancellable(request: Request, token: CancelToken, fn, *args):
+    """Run blocking work in the threadpool, cancelling it if the client leaves or the deadline passes"""
+    watcher = asyncio.create_task(watch_request(request, token))
+    try:
+        return await run_in_threadpool(fn, *args)
+    finally:
+        watcher.cancel()
+
+async def watch_body(body: AsyncIterator[bytes], request: Request, token: CancelToken) -> AsyncIterator[bytes]:
+    watcher = asyncio.create_task(watch_request(request, token))
+    completed = False
+    try:
+        async for chunk in body:
+            yield chunk
+        completed = True
+    finally:
+        watcher.cancel()
+        if not completed:
+            token.cancel("disconnect")
+
+def cancel_with_request(response: Response, request: Request, token: CancelToken) -> Response:
+    """
+    Keep watching the client while a streamed body is generated: the worker
+    thread producing it is only interrupted through the token, since Starlette
+    can cancel the response task only between chunks.
+    """
+    if isinstance(response, StreamingResponse):
+        response.body_iterator = watch_body(response.body_iterator, request, token)
+    return response
+
+def release_after(response: Response, lane: Lane, acquired: float) -> Response:
+    """Keep the lane slot until a streamed body has been sent; release it now otherwise"""
+    if isinstance(response, StreamingResponse):
+        response.body_iterator = lane.hold(response.body_iterator, acquired)
+    else:
+        lane.release(acquired)
+    return response
+
+async def generate_blog(
+    request: Request,
+    token: CancelToken,
+    input_type: str,
+    output_type: str,
+    text_input: Optional[str],
+    voice_input: Optional[UploadFile],
+    language: str,
+    tone: str,
+    length: int,
+    stream: bool,
+    lane: str
+) -> Response:
+    """Run the workflow for an admitted /blogs request and build its response"""
     temp_path = None
     try:
         language = language.lower()
@@ -82,13 +496,22 @@ async def create_blogs(
                 {"error": f"Invalid language. Supported: {[lang.value for lang in Language]}"},
                 status_code=400
             )
+        request_info = {
+            "input_type": input_type,
+            "output_type": output_type,
+            "language": language,
+            "tone": tone.lower(),
+            "length": length,
+            "lane": lane
+        }
 
-        # Initialize state
+        # Initialize state; audio is synthesized per section for the response, not in the graph
         state = {
             "language": language,
             "current_language": language,
             "tone": tone.lower(),
-            "length": length
+            "length": length,
+            "synthesize_audio": False
         }
 
         # Handle input
@@ -96,15 +519,26 @@ async def create_blogs(
             if not voice_input:
                 return JSONResponse({"error": "Voice file required when input_type=voice"}, status_code=400)
             
-            temp_path = f"temp_{voice_input.filename}"
-            with open(temp_path, "wb") as f:
-                shutil.copyfileobj(voice_input.file, f)
+            # Unique per request so concurrent uploads of the same filename don't collide
+            suffix = os.path.splitext(voice_input.filename or "")[1] or ".wav"
+            fd, temp_path = tempfile.mkstemp(prefix="temp_", suffix=suffix, dir=".")
+            temp_path = os.path.relpath(temp_path)
+
+            # Hash while streaming to disk; the digest keys the transcript cache
+            digest = hashlib.sha256()
+            with os.fdopen(fd, "wb") as f:
+                while chunk := await voice_input.read(UPLOAD_CHUNK_SIZE):
+                    digest.update(chunk)
+                    f.write(chunk)
+            state["voice_input_sha256"] = digest.hexdigest()
             
             try:
-                validate_audio_path(temp_path)
+                # Validation decodes the whole upload; keep it off the event loop
+                await run_in_threadpool(validate_audio_path, temp_path)
                 state["voice_input_path"] = temp_path
             except Exception as e:
                 logger.error(f"Invalid audio file: {str(e)}")
+                cleanup_temp_file(temp_path)
                 return JSONResponse({"error": f"Invalid audio file: {str(e)}"}, status_code=400)
         elif input_type == "text":
             if not text_input:
@@ -113,58 +547,50 @@ async def create_blogs(
 
         # Process request
         usecase = "voice" if input_type == "voice" else "language" if language != "english" else "topic"
-        llm = GroqLLM().get_llm()
-        graph = GraphBuilder(llm).setup_graph(usecase)
-        result = graph.invoke(state)
+        graph = get_graph(usecase)
+
+        # Progressive output: NDJSON events, generated in the threadpool by StreamingResponse
+        if stream:
+            return StreamingResponse(
+                stream_blog_events(graph, state, request_info, token, temp_path),
+                media_type="application/x-ndjson"
+            )
+
+        # The workflow blocks on provider calls; keep it off the event loop
+        result = await run_cancellable(request, token, graph.invoke, state, cancel_config(token))
+        summary = processing_summary(result)
+        record = await run_in_threadpool(persist_blog, request_info, result)
 
-        
         # Voice output with proper streaming
         if output_type == "voice":
             content = result.get("blog", {}).get("content", "")
             if not content:
+                if temp_path:
+                    cleanup_temp_file(temp_path)
                 return JSONResponse({"error": "No content to convert to speech"}, status_code=400)
 
-            voice_id = {
-        "english": "EXAVITQu4vr4xnSDxMaL",  # Rachel
-        "hindi": "AZnzlk1XvdvUeBnXmlld",    # Domi
-        "french": "XB0fDUnXU5powFXDhCwa",    # Bella
-        "spanish": "ErXwobaYiN019PkySvjV",   # Antoni
-        "german": "MF3mGyEYCl7XYWbV9V6O"     # Elli
-    }.get(language, "EXAVITQu4vr4xnSDxMaL")  # Default to Rachel
-
-            logger.info(f"Generating voice output with voice ID: {voice_id}")
-
-    # Create streaming response
-            def generate_audio():
-                try:
-                    audio_generator = ELEVENLABS_CLIENT.text_to_speech.convert(
-                text=content,
-                voice_id=voice_id,
-                model_id="eleven_monolingual_v1",
-                output_format="mp3_44100_128"
-            )
-            
-            # Stream the audio chunks directly
-                    for chunk in audio_generator:
-                        yield chunk
-                
-                except Exception as e:
-                    logger.error(f"Streaming error: {str(e)}")
-                    raise
-
-    # Cleanup task
+            # The blog id is already public (X-Blog-Id), so its /audio could be requested meanwhile
+            claim = uuid.uuid4().hex if record else None
+            if claim:
+                await run_in_threadpool(claim_audio, record["id"], claim)
+
+            # Cleanup task
             cleanup = BackgroundTask(cleanup_temp_file, temp_path) if temp_path else None
 
             return StreamingResponse(
-        generate_audio(),
-        media_type="audio/mpeg",
-        headers={
-            "Content-Disposition": 'attachment; filename="blog_audio.mp3"',
-            "X-Title": result.get("blog", {}).get("title", ""),
-            "X-Language": language
-        },
-        background=cleanup
-    )
+                stream_audio(record, content, language, token, claim),
+                media_type="audio/mpeg",
+                headers={
+                    "Content-Disposition": 'attachment; filename="blog_audio.mp3"',
+                    # Header values must be latin-1 without newlines; titles may be Hindi etc.
+                    "X-Title": quote(result.get("blog", {}).get("title", "")),
+                    "X-Language": language,
+                    "X-Processing-Time": f"{summary['processing_time'] or 0:.3f}",
+                    "X-Processing-Steps": ",".join(summary["processing_steps"]),
+                    "X-Blog-Id": record["id"] if record else ""
+                },
+                background=cleanup
+            )
 
         # Text output
         if temp_path:
@@ -172,17 +598,193 @@ async def create_blogs(
         return JSONResponse({
             "title": result.get("blog", {}).get("title", ""),
             "content": result.get("blog", {}).get("content", ""),
-            "language": language
+            "language": language,
+            "metrics": summary,
+            **blog_links(record)
         })
 
+    except Cancelled as e:
+        if temp_path:
+            cleanup_temp_file(temp_path)
+        logger.warning(f"Generation stopped: {e}")
+        return cancelled_response(e)
     except Exception as e:
         if temp_path:
             cleanup_temp_file(temp_path)
         logger.error(f"Processing failed: {str(e)}", exc_info=True)
-        return JSONResponse(
-            {"error": "Processing failed", "details": str(e)},
-            status_code=500
+        ERRORS.labels(component="request").inc()
+        return JSONResponse({"error": "Processing failed", "details": str(e)}, status_code=500)
+
+@app.get("/blogs/{blog_id}")
+def get_blog(blog_id: str, request: Request):
+    """Stored blog as Markdown, served from precompressed files with ETag revalidation"""
+    record = get_artifact_store().get_blog(blog_id)
+    if record is None:
+        return JSONResponse({"error": "Unknown blog id"}, status_code=404)
+    return serve_artifact(request, record["markdown"], "text/markdown; charset=utf-8")
+
+@app.get("/blogs/{blog_id}/metadata")
+def get_blog_metadata(blog_id: str):
+    """Stored blog record: request settings, title, metrics and artifact references"""
+    record = get_artifact_store().get_blog(blog_id)
+    if record is None:
+        return JSONResponse({"error": "Unknown blog id"}, status_code=404)
+    return JSONResponse({**record, **blog_links(record)})
+
+@app.get("/blogs/{blog_id}/audio")
+async def blog_audio(blog_id: str, request: Request):
+    """MP3 for a voice-output blog, synthesized on the first request and served from disk after that"""
+    store = get_artifact_store()
+    record = await run_in_threadpool(store.get_blog, blog_id)
+    if record is None:
+        return JSONResponse({"error": "Unknown blog id"}, status_code=404)
+    if record.get("audio"):
+        return serve_artifact(request, record["audio"], "audio/mpeg")
+    if record["output_type"] != "voice":
+        return JSONResponse({"error": "This blog was generated without audio"}, status_code=404)
+    lane = LANES[record.get("lane", "text_voice")]
+
+    # One synthesis per blog across all workers; other requests wait for its result
+    claim = uuid.uuid4().hex
+    waited_until = time.monotonic() + ADMISSION_QUEUE_TIMEOUT
+    while not await run_in_threadpool(claim_audio, blog_id, claim):
+        if time.monotonic() >= waited_until or await request.is_disconnected():
+            return JSONResponse(
+                {"error": "Audio is being synthesized, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(lane.retry_after())}
+            )
+        await asyncio.sleep(AUDIO_WAIT_INTERVAL)
+        record = await run_in_threadpool(store.get_blog, blog_id)
+        if record.get("audio"):
+            return serve_artifact(request, record["audio"], "audio/mpeg")
+    # The previous holder may have finished between the first read and the claim
+    record = await run_in_threadpool(store.get_blog, blog_id)
+    if record.get("audio"):
+        await run_in_threadpool(release_audio, blog_id, claim)
+        return serve_artifact(request, record["audio"], "audio/mpeg")
+
+    # Synthesis is the expensive half of a voice request; admit it in the lane it came from
+    try:
+        acquired = await lane.acquire()
+    except LaneFull as e:
+        await run_in_threadpool(release_audio, blog_id, claim)
+        return busy_response(e)
+    except asyncio.CancelledError:
+        # The client left while queued; don't make other requests wait out the claim.
+        # Shielded so a repeated cancellation can't stop the release halfway
+        await asyncio.shield(run_in_threadpool(release_audio, blog_id, claim))
+        raise
+
+    token = CancelToken(REQUEST_DEADLINE)
+    response = StreamingResponse(stream_audio(record, "", record["language"], token, claim), media_type="audio/mpeg")
+    return release_after(cancel_with_request(response, request, token), lane, acquired)
+
+@app.post("/blogs/{blog_id}/revisions")
+async def revise_blog(
+    blog_id: str,
+    request: Request,
+    section: Optional[int] = Form(None),
+    instructions: Optional[str] = Form(None),
+    tone: Optional[str] = Form(None),
+    length: Optional[int] = Form(None)
+):
+    """
+    Store a revised copy of a blog. Only the requested section (or every section,
+    for a new tone, length or instructions without a section) is rewritten and
+    translated again; the title and untouched sections keep their text,
+    translation and audio.
+    """
+    start = time.perf_counter()
+    token = CancelToken(REQUEST_DEADLINE)
+    # SharedStore.hit can wait up to its SQLite busy timeout for another worker's lock
+    limited = await run_in_threadpool(check_rate_limit, request)
+    if limited:
+        return observe_request(start, "revision", "text", limited)
+
+    store = get_artifact_store()
+    record = await run_in_threadpool(store.get_blog, blog_id)
+    if record is None:
+        return observe_request(start, "revision", "text", JSONResponse({"error": "Unknown blog id"}, status_code=404))
+    if "source_sections" not in record:
+        return observe_request(start, "revision", "text", JSONResponse(
+            {"error": "This blog was stored without sections and cannot be revised"}, status_code=409
+        ))
+    sources = await run_in_threadpool(read_sections, record["source_sections"])
+    tone = (tone or record["tone"]).lower()
+    length = length or record["length"]
+
+    if section is not None:
+        if not 0 <= section < len(sources):
+            return observe_request(start, "revision", "text", JSONResponse(
+                {"error": f"section must be between 0 and {len(sources) - 1}"}, status_code=400
+            ))
+        revise = [section]
+    elif instructions or tone != record["tone"] or length != record["length"]:
+        revise = list(range(len(sources)))
+    else:
+        return observe_request(start, "revision", "text", JSONResponse(
+            {"error": "Nothing to revise: pass section, instructions, tone or length"}, status_code=400
+        ))
+
+    # Revisions only call the LLM, whatever the original input was
+    lane = LANES["text"]
+    try:
+        acquired = await lane.acquire()
+    except LaneFull as e:
+        return observe_request(start, "revision", "text", busy_response(e))
+
+    try:
+        state = {
+            "topic": record["topic"],
+            "language": record["language"],
+            "current_language": record["language"],
+            "tone": tone,
+            "length": length,
+            "blog": {"title": record["title"]},
+            "source_sections": sources,
+            "sections": await run_in_threadpool(read_sections, [ref["content"] for ref in record["sections"]]),
+            "revise_sections": revise,
+            "revision_instructions": instructions,
+            "translate": record.get("translate", False)
+        }
+        result = await run_cancellable(request, token, get_graph("revision").invoke, state, cancel_config(token))
+        summary = processing_summary(result)
+        fields = {
+            **{key: record[key] for key in ("input_type", "output_type", "language", "lane", "topic", "translate")},
+            "tone": tone,
+            "length": length,
+            "revision_of": record["id"],
+            "revised_sections": revise,
+            "metrics": summary,
+        }
+        # Sections whose published text is unchanged keep their audio
+        reuse_audio = {ref["content"]["sha256"]: ref["audio"] for ref in record["sections"] if ref.get("audio")}
+        revised = await run_in_threadpool(
+            store_blog, fields, record["title"], result["source_sections"], result["sections"], reuse_audio
         )
+    except Cancelled as e:
+        logger.warning(f"Revision stopped: {e}")
+        return observe_request(start, "revision", "text", cancelled_response(e))
+    except Exception as e:
+        logger.error(f"Revision failed: {str(e)}", exc_info=True)
+        ERRORS.labels(component="request").inc()
+        return observe_request(start, "revision", "text", JSONResponse(
+            {"error": "Processing failed", "details": str(e)}, status_code=500
+        ))
+    finally:
+        lane.release(acquired)
+
+    return observe_request(start, "revision", "text", JSONResponse({
+        "title": revised["title"],
+        "content": result["blog"]["content"],
+        "language": revised["language"],
+        "revision_of": record["id"],
+        "revised_sections": revise,
+        "metrics": summary,
+        **blog_links(revised)
+    }))
 
 if __name__ == "__main__":
+    # Development server (single process, auto-reload); use serve.py in production
     uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True,timeout_keep_alive=300,timeout_graceful_shutdown=30)
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""
+Byte and latency savings of the speech-to-text preprocessing stage.
+
+Generates recordings shaped like the Streamlit `audio_recorder` output
+(48 kHz 16-bit WAV with silence around the speech and up to `pause_threshold`
+seconds of trailing silence), runs `preprocess_for_stt` on them and estimates
+the end-to-end effect for a given uplink and STT throughput.
+
+    python -m benchmarks.bench_audio
+    FFMPEG_PATH=/usr/bin/ffmpeg python -m benchmarks.bench_audio --uplink-mbps 2
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.fakes import make_wav
+from src.nodes.audio import preprocess_for_stt, STT_AUDIO_FORMAT
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure STT audio preprocessing savings")
+    parser.add_argument("--speech-seconds", default="3,5,10", help="Comma-separated speech durations")
+    parser.add_argument("--silence", type=float, default=2.0, help="Seconds of silence on each end")
+    parser.add_argument("--channels", type=int, default=1)
+    parser.add_argument("--sample-rate", type=int, default=48000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--uplink-mbps", type=float, default=5.0, help="Client/server uplink to the STT API")
+    parser.add_argument("--stt-seconds-per-mb", type=float, default=2.0,
+                        help="Provider queue+processing time per uploaded MB")
+    args = parser.parse_args(argv)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print(f"Target format: {STT_AUDIO_FORMAT} (falls back to WAV without ffmpeg)\n")
+    header = (f"{'speech s':>9}{'format':>8}{'in KB':>10}{'out KB':>10}{'ratio':>8}{'prep ms':>9}"
+              f"{'before s':>10}{'after s':>9}{'saved s':>9}")
+    print(header)
+    print("-" * len(header))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for seconds in [float(s) for s in args.speech_seconds.split(",") if s]:
+            source = make_wav(os.path.join(workdir, f"rec_{seconds}.wav"), seconds=seconds,
+                              sample_rate=args.sample_rate, channels=args.channels, silence=args.silence)
+            timings, stats = [], None
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                stats = preprocess_for_stt(source)
+                timings.append(time.perf_counter() - start)
+                os.remove(stats["path"])
+            prep = statistics.median(timings)
+
+            in_mb = stats["input_bytes"] / (1024 * 1024)
+            out_mb = stats["output_bytes"] / (1024 * 1024)
+            bytes_per_second = args.uplink_mbps * 1_000_000 / 8 / (1024 * 1024)
+            before = in_mb / bytes_per_second + in_mb * args.stt_seconds_per_mb
+            after = prep + out_mb / bytes_per_second + out_mb * args.stt_seconds_per_mb
+            output_format = os.path.splitext(stats["path"])[1].lstrip(".")
+            print(f"{seconds:>9.1f}{output_format:>8}{stats['input_bytes'] / 1024:>10.1f}{stats['output_bytes'] / 1024:>10.1f}"
+                  f"{stats['input_bytes'] / stats['output_bytes']:>7.1f}x{prep * 1000:>9.1f}"
+                  f"{before:>10.2f}{after:>9.2f}{before - after:>9.2f}")
+
+    print("\nbefore/after = estimated upload + STT time for the raw vs preprocessed file.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""
+Offline benchmark of every BlogNode method and every GraphBuilder workflow.
+
+Providers are replaced by the deterministic fakes in `benchmarks/fakes.py`, so
+the numbers measure our own overhead (prompt building, state handling,
+LangGraph dispatch, file I/O) plus whatever provider latency is configured.
+
+    python -m benchmarks.bench_nodes                     # report only
+    python -m benchmarks.bench_nodes --save-baseline     # record a baseline
+    python -m benchmarks.bench_nodes --check             # exit 1 on regression
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+import itertools
+from typing import Any, Callable, Dict, List, Optional
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from benchmarks.fakes import FakeChatModel, FakeSTT, FakeTTS, fake_markdown, make_wav
+from src.cache.translation_memory import TranslationMemory
+from src.graphs.graph_builder import GraphBuilder
+from src.nodes.sections import split_sections
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "nodes.json")
+
+# A regression must exceed both the relative tolerance and these absolute floors
+OVERHEAD_FLOOR_MS = 0.5
+MEMORY_FLOOR_KB = 64.0
+
+
+class Providers:
+    """The set of fakes shared by every case, with a combined busy clock."""
+
+    def __init__(self, args):
+        self.llm = FakeChatModel(
+            latency=args.llm_latency,
+            tokens_per_second=args.tokens_per_second,
+            output_words=args.output_words,
+        )
+        self.stt = FakeSTT(latency=args.stt_latency)
+        self.tts = FakeTTS(latency=args.tts_latency, bytes_per_char=args.tts_bytes_per_char)
+
+    def busy(self) -> float:
+        return self.llm.busy_seconds + self.stt.busy_seconds + self.tts.busy_seconds
+
+    def builder(self, translation_memory: Optional[TranslationMemory] = None) -> GraphBuilder:
+        # Without a memory given, translations always reach the LLM so their cost stays measured
+        return GraphBuilder(self.llm, stt_client=self.stt, tts_client=self.tts,
+                            translation_memory=translation_memory or TranslationMemory(""))
+
+
+def build_cases(providers: Providers, workdir: str, args) -> Dict[str, Callable[[], Any]]:
+    """Map case name -> zero-argument callable executing one unit of work."""
+    voice_path = make_wav(os.path.join(workdir, "prompt.wav"), seconds=args.voice_seconds)
+    content = fake_markdown(args.output_words)
+    blog = {"title": "Agentic AI in Production", "content": content}
+    node = providers.builder().blog_node
+    tm_node = providers.builder(TranslationMemory(os.path.join(workdir, "translation_memory.sqlite3"))).blog_node
+    revisions = itertools.count()
+
+    def unseen_content() -> str:
+        # Tag every line so no segment is in the translation memory yet
+        n = next(revisions)
+        return "\n".join(f"{line} r{n}" if line.strip() else line for line in content.split("\n"))
+
+    text_state = {"topic": "Agentic AI", "language": "english", "current_language": "english"}
+    drafted_state = {**text_state, "blog": blog}
+    translated_state = {**drafted_state, "language": "french", "current_language": "french"}
+    voice_state = {"voice_input_path": voice_path, "language": "german", "current_language": "german"}
+    # Rewrite one section of a stored French blog
+    revision_state = {
+        **translated_state, "tone": "professional", "length": args.output_words, "translate": True,
+        "source_sections": split_sections(content), "sections": split_sections(content), "revise_sections": [1],
+    }
+
+    usecases = ("topic", "language", "voice", "revision")
+    graphs = {usecase: providers.builder().setup_graph(usecase) for usecase in usecases}
+    # Every step's state is serialized into the checkpointer, as under a persistent deployment
+    checkpointed = providers.builder().build_voice_graph().compile(checkpointer=MemorySaver())
+
+    def checkpointed_voice():
+        thread_id = uuid.uuid4().hex
+        checkpointed.invoke(dict(voice_state), {"configurable": {"thread_id": thread_id}})
+        checkpointed.checkpointer.delete_thread(thread_id)
+
+    return {
+        "node.title_creation": lambda: node.title_creation(text_state),
+        "node.content_generation": lambda: node.content_generation({**text_state, "blog": {"title": blog["title"]}}),
+        "node.translation": lambda: node.translation(translated_state),
+        "node.translation_tm_cold": lambda: tm_node.translation(
+            {**translated_state, "blog": {**blog, "content": unseen_content()}}
+        ),
+        "node.translation_tm_warm": lambda: tm_node.translation(translated_state),
+        "node.route": lambda: node.route(translated_state),
+        "node.section_revision": lambda: node.section_revision(revision_state),
+        "node.section_translation": lambda: node.section_translation(revision_state),
+        "node.voice_input_node": lambda: node.voice_input_node(voice_state),
+        "node.voice_output_node": lambda: node.voice_output_node(drafted_state),
+        "compile.topic": lambda: providers.builder().setup_graph("topic"),
+        "compile.language": lambda: providers.builder().setup_graph("language"),
+        "compile.voice": lambda: providers.builder().setup_graph("voice"),
+        "graph.topic": lambda: graphs["topic"].invoke(dict(text_state)),
+        "graph.language": lambda: graphs["language"].invoke({**text_state, "language": "french", "current_language": "french"}),
+        "graph.voice": lambda: graphs["voice"].invoke(dict(voice_state)),
+        "graph.voice_checkpointed": checkpointed_voice,
+        "graph.revision": lambda: graphs["revision"].invoke(dict(revision_state)),
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(fn: Callable[[], Any], providers: Providers, iterations: int, warmup: int) -> Dict[str, float]:
+    """Time `fn`, separating our own overhead from simulated provider time."""
+    for _ in range(warmup):
+        fn()
+
+    walls, overheads = [], []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        busy_before = providers.busy()
+        t0 = time.perf_counter()
+        fn()
+        wall = time.perf_counter() - t0
+        walls.append(wall)
+        overheads.append(wall - (providers.busy() - busy_before))
+    total = time.perf_counter() - started
+
+    # Memory is measured on a separate run because tracemalloc slows execution
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "wall_ms_p50": statistics.median(walls) * 1000,
+        "wall_ms_p95": percentile(walls, 95) * 1000,
+        "overhead_ms_p50": statistics.median(overheads) * 1000,
+        "overhead_ms_p95": percentile(overheads, 95) * 1000,
+        "peak_kb": peak / 1024,
+        "ops_per_sec": iterations / total if total else 0.0,
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[str]:
+    """Return human-readable regression messages against a stored baseline."""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric, floor in (("overhead_ms_p50", OVERHEAD_FLOOR_MS), ("peak_kb", MEMORY_FLOOR_KB)):
+            before, after = base.get(metric), current[metric]
+            if before is None:
+                continue
+            if after > before * (1 + tolerance) and after - before > floor:
+                regressions.append(f"{name}: {metric} {before:.2f} -> {after:.2f}")
+    return regressions
+
+
+def print_table(results: Dict[str, Dict[str, float]]):
+    header = f"{'case':<26}{'wall p50':>10}{'wall p95':>10}{'ovh p50':>10}{'ovh p95':>10}{'peak KB':>10}{'ops/s':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(f"{name:<26}{r['wall_ms_p50']:>10.2f}{r['wall_ms_p95']:>10.2f}{r['overhead_ms_p50']:>10.2f}"
+              f"{r['overhead_ms_p95']:>10.2f}{r['peak_kb']:>10.1f}{r['ops_per_sec']:>10.1f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline BlogNode/GraphBuilder benchmark")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--only", default="", help="Comma-separated case name prefixes to run")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds per LLM call")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--output-words", type=int, default=600, help="Words per LLM response")
+    parser.add_argument("--stt-latency", type=float, default=0.0)
+    parser.add_argument("--tts-latency", type=float, default=0.0)
+    parser.add_argument("--tts-bytes-per-char", type=int, default=1000)
+    parser.add_argument("--voice-seconds", type=float, default=4.0, help="Length of the fake recording")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    parser.add_argument("--verbose", action="store_true", help="Keep node INFO logging")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+    providers = Providers(args)
+    prefixes = [p for p in args.only.split(",") if p]
+    baseline_path = os.path.abspath(args.baseline)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # voice_output_node stores its MP3 in an artifact store under the working directory
+        os.chdir(workdir)
+        try:
+            cases = build_cases(providers, workdir, args)
+            results = {}
+            for name, fn in cases.items():
+                if prefixes and not any(name.startswith(p) for p in prefixes):
+                    continue
+                results[name] = measure(fn, providers, args.iterations, args.warmup)
+        finally:
+            os.chdir(cwd)
+
+    print_table(results)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {baseline_path}")
+        return 0
+
+    if os.path.exists(baseline_path):
+        with open(baseline_path) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1 if args.check else 0
+        print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+Deterministic local stand-ins for the Groq chat model, ElevenLabs TTS and
+AssemblyAI STT so graphs can be exercised without network access.
+"""
+import math
+import os
+import re
+import struct
+import time
+import wave
+from typing import Any, Iterator, List, Optional
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+# Prompt cues the fake follows so a reply is sized like a real one
+WORD_TARGET = re.compile(r"about (\d+) words")
+TRANSLATION_INPUT = "Content to translate:"
+SEGMENT_INPUT = "Segments to translate:"
+SEGMENT_MARKER = re.compile(r"<<<SEG \d+>>>")
+
+WORDS = [
+    "agentic", "systems", "plan", "reason", "and", "act", "across", "tools",
+    "while", "teams", "measure", "latency", "quality", "cost", "with", "care",
+]
+
+
+def fake_markdown(n_words: int) -> str:
+    """Build a deterministic markdown body of roughly n_words words."""
+    lines = []
+    for i in range(n_words):
+        if i % 80 == 0:
+            lines.append(f"\n\n## Section {i // 80 + 1}\n\n")
+        lines.append(WORDS[i % len(WORDS)] + " ")
+    return "".join(lines).strip()
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model returning fixed-size markdown after a configurable delay."""
+
+    latency: float = 0.0            # seconds before the first token
+    tokens_per_second: float = 0.0  # 0 streams every token immediately
+    output_words: int = 600
+    busy_seconds: float = 0.0       # total simulated provider time
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _text(self, messages: List[BaseMessage]) -> str:
+        prompt = "\n".join(str(m.content) for m in messages)
+        target = WORD_TARGET.search(prompt)
+        if target:
+            return fake_markdown(int(target.group(1)))
+        if SEGMENT_INPUT in prompt:
+            # Keep each marker, followed by a "translation" as long as its segment
+            segments = prompt.split(SEGMENT_INPUT, 1)[1]
+            markers = SEGMENT_MARKER.findall(segments)
+            texts = SEGMENT_MARKER.split(segments)[1:]
+            return "\n".join(
+                f"{marker}\n" + " ".join(WORDS[i % len(WORDS)] for i in range(len(text.split())))
+                for marker, text in zip(markers, texts)
+            )
+        if TRANSLATION_INPUT in prompt:
+            # A translation is about as long as its input
+            return fake_markdown(len(prompt.split(TRANSLATION_INPUT, 1)[1].split()))
+        return fake_markdown(self.output_words)
+
+    def _usage(self, messages: List[BaseMessage], text: str) -> dict:
+        input_tokens = sum(len(str(m.content).split()) for m in messages)
+        output_tokens = len(text.split())
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text = self._text(messages)
+        delay = self.latency
+        if self.tokens_per_second:
+            delay += len(text.split()) / self.tokens_per_second
+        time.sleep(delay)
+        self.busy_seconds += delay
+        message = AIMessage(content=text, usage_metadata=self._usage(messages, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        text = self._text(messages)
+        time.sleep(self.latency)
+        self.busy_seconds += self.latency
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            if self.tokens_per_second:
+                time.sleep(1 / self.tokens_per_second)
+                self.busy_seconds += 1 / self.tokens_per_second
+            token = word if i == len(words) - 1 else word + " "
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+        yield ChatGenerationChunk(
+            message=AIMessageChunk(content="", usage_metadata=self._usage(messages, text))
+        )
+
+
+class _FakeTranscript:
+    def __init__(self, text: str):
+        self.text = text
+        self.status = "completed"
+        self.error = None
+
+
+class _FakeTranscriber:
+    def __init__(self, stt: "FakeSTT"):
+        self.stt = stt
+
+    def transcribe(self, path, config=None) -> _FakeTranscript:
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        delay = self.stt.latency + self.stt.latency_per_mb * size_mb
+        time.sleep(delay)
+        self.stt.busy_seconds += delay
+        self.stt.calls += 1
+        return _FakeTranscript(self.stt.text)
+
+
+class FakeSTT:
+    """Mimics the `assemblyai` module: `FakeSTT().Transcriber().transcribe(path)`."""
+
+    def __init__(self, text: str = "Agentic AI in production", latency: float = 0.0,
+                 latency_per_mb: float = 0.0):
+        self.text = text
+        self.latency = latency
+        self.latency_per_mb = latency_per_mb
+        self.calls = 0
+        self.busy_seconds = 0.0
+
+    def Transcriber(self, config=None) -> _FakeTranscriber:
+        return _FakeTranscriber(self)
+
+
+class _FakeTextToSpeech:
+    def __init__(self, tts: "FakeTTS"):
+        self.tts = tts
+
+    def convert(self, text: str, voice_id: str = "", model_id: str = "",
+                output_format: str = "mp3_44100_128", **kwargs) -> Iterator[bytes]:
+        tts = self.tts
+        tts.calls += 1
+        remaining = len(text) * tts.bytes_per_char
+        time.sleep(tts.latency)
+        tts.busy_seconds += tts.latency
+        while remaining > 0:
+            size = min(tts.chunk_size, remaining)
+            if tts.chunk_delay:
+                time.sleep(tts.chunk_delay)
+                tts.busy_seconds += tts.chunk_delay
+            remaining -= size
+            yield b"\xff" * size
+
+
+class FakeTTS:
+    """Mimics `ElevenLabs`: `FakeTTS().text_to_speech.convert(...)` yields MP3-sized chunks."""
+
+    def __init__(self, latency: float = 0.0, bytes_per_char: int = 1000,
+                 chunk_size: int = 4096, chunk_delay: float = 0.0):
+        self.latency = latency
+        self.bytes_per_char = bytes_per_char
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.calls = 0
+        self.busy_seconds = 0.0
+        self.text_to_speech = _FakeTextToSpeech(self)
+
+
+def make_wav(path: str, seconds: float = 4.0, sample_rate: int = 48000, channels: int = 1,
+             silence: float = 0.0) -> str:
+    """Write a 16-bit sine-tone WAV, optionally padded with `silence` seconds on both ends."""
+    frames = []
+    pad = int(silence * sample_rate)
+    tone = int(seconds * sample_rate)
+    for i in range(pad + tone + pad):
+        value = 0
+        if pad <= i < pad + tone:
+            value = int(8000 * math.sin(2 * math.pi * 220 * i / sample_rate))
+        frames.append(struct.pack("<h", value) * channels)
+    with wave.open(path, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(b"".join(frames))
+    return path
@@ -0,0 +1,93 @@
+"""
+Cold-start import time of the API (or any module) in fresh interpreters.
+
+Each sample runs `import <module>` in a new process, so nothing is cached
+except the OS page cache and compiled .pyc files. `--rev` measures another git
+revision side by side through a temporary worktree, e.g. to compare against
+the commit before a startup optimisation:
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --module src.graphs.graph_builder --rev HEAD~1
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+# Modules that only voice requests should need
+VOICE_MODULES = ["elevenlabs", "assemblyai", "pydub"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "modules": len(sys.modules),
+    "voice_modules": [m for m in {voice} if m in sys.modules],
+}}))
+"""
+
+
+def sample(module: str, cwd: str) -> Dict:
+    code = PROBE.format(module=module, voice=VOICE_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=cwd, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure(module: str, cwd: str, runs: int) -> Dict:
+    sample(module, cwd)  # warm .pyc files so only imports are timed
+    samples: List[Dict] = [sample(module, cwd) for _ in range(runs)]
+    seconds = [s["seconds"] for s in samples]
+    return {
+        "median_ms": statistics.median(seconds) * 1000,
+        "min_ms": min(seconds) * 1000,
+        "modules": samples[-1]["modules"],
+        "voice_modules": samples[-1]["voice_modules"],
+    }
+
+
+def report(label: str, result: Dict):
+    voice = ", ".join(result["voice_modules"]) or "none"
+    print(f"{label:<14} median {result['median_ms']:8.1f} ms   min {result['min_ms']:8.1f} ms   "
+          f"{result['modules']:5d} modules   voice SDKs loaded: {voice}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold-start import time")
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--rev", help="Also measure this git revision for comparison")
+    args = parser.parse_args(argv)
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    current = measure(args.module, root, args.runs)
+
+    if args.rev:
+        with tempfile.TemporaryDirectory() as tmp:
+            worktree = os.path.join(tmp, "rev")
+            subprocess.run(["git", "worktree", "add", "--detach", worktree, args.rev],
+                           cwd=root, check=True, capture_output=True)
+            try:
+                other = measure(args.module, worktree, args.runs)
+            finally:
+                subprocess.run(["git", "worktree", "remove", "--force", worktree],
+                               cwd=root, capture_output=True)
+        report(args.rev, other)
+        report("working tree", current)
+        print(f"\nDifference: {other['median_ms'] - current['median_ms']:+.1f} ms "
+              f"({(1 - current['median_ms'] / other['median_ms']) * 100:.0f}% faster)")
+    else:
+        report("working tree", current)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
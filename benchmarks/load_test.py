@@ -0,0 +1,265 @@
+"""
+HTTP load harness for the `/blogs` endpoint.
+
+Boots `app.py` in a single uvicorn worker against the stand-in providers
+(`benchmarks/stub_server.py`) unless `--url` points at a running server, then
+drives each input/output combination from `test_blog_requests.py`:
+
+    closed loop: N virtual users each send the next request as soon as the
+                 previous one completes (measures max sustainable throughput)
+    open loop:   requests arrive at a fixed Poisson rate regardless of how fast
+                 the server answers (exposes queueing and event-loop blocking)
+
+    python -m benchmarks.load_test --mode closed --concurrency 8 --duration 20
+    python -m benchmarks.load_test --mode open --rate 5 --cases text-voice
+
+`--mix` runs the selected cases at the same time instead of one after
+another, e.g. to see how voice traffic affects text latency:
+
+    python -m benchmarks.load_test --mix --mode open --rate 4 --cases text-text,voice-voice
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.fakes import make_wav
+
+CASES = {
+    "text-text": {"input_type": "text", "output_type": "text", "language": "english"},
+    "text-voice": {"input_type": "text", "output_type": "voice", "language": "french"},
+    "voice-text": {"input_type": "voice", "output_type": "text", "language": "hindi"},
+    "voice-voice": {"input_type": "voice", "output_type": "voice", "language": "german"},
+}
+
+
+@dataclass
+class Sample:
+    ok: bool
+    status: int
+    latency: float
+    ttfb: Optional[float]
+    size: int
+    error: str = ""
+
+
+@dataclass
+class CaseResult:
+    case: str
+    duration: float
+    samples: List[Sample] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, float]:
+        ok = [s for s in self.samples if s.ok]
+        latencies = sorted(s.latency for s in ok)
+        ttfbs = sorted(s.ttfb for s in ok if s.ttfb is not None)
+        total = len(self.samples)
+        return {
+            "requests": total,
+            "errors": total - len(ok),
+            "error_rate": (total - len(ok)) / total if total else 0.0,
+            "throughput_rps": len(ok) / self.duration if self.duration else 0.0,
+            "latency_p50": percentile(latencies, 50),
+            "latency_p95": percentile(latencies, 95),
+            "latency_p99": percentile(latencies, 99),
+            "ttfb_p50": percentile(ttfbs, 50),
+            "ttfb_p95": percentile(ttfbs, 95),
+            "ttfb_p99": percentile(ttfbs, 99),
+        }
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return float("nan")
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def send(client: httpx.AsyncClient, url: str, case: str, audio: bytes) -> Sample:
+    """Send one request, reading the body as a stream to capture time-to-first-byte."""
+    data = dict(CASES[case])
+    files = None
+    if data["input_type"] == "voice":
+        files = {"voice_input": ("prompt.wav", audio, "audio/wav")}
+    else:
+        data["text_input"] = "Agentic AI"
+
+    start = time.perf_counter()
+    ttfb, size = None, 0
+    try:
+        async with client.stream("POST", url, data=data, files=files) as response:
+            async for chunk in response.aiter_raw():
+                if ttfb is None:
+                    ttfb = time.perf_counter() - start
+                size += len(chunk)
+        latency = time.perf_counter() - start
+        ok = response.status_code == 200
+        return Sample(ok, response.status_code, latency, ttfb, size, "" if ok else f"HTTP {response.status_code}")
+    except httpx.HTTPError as e:
+        return Sample(False, 0, time.perf_counter() - start, ttfb, size, type(e).__name__)
+
+
+async def closed_loop(url: str, case: str, audio: bytes, concurrency: int, duration: float,
+                      timeout: float) -> CaseResult:
+    result = CaseResult(case, duration)
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        async def user():
+            while time.perf_counter() < deadline:
+                result.samples.append(await send(client, url, case, audio))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        result.duration = time.perf_counter() - started
+    return result
+
+
+async def open_loop(url: str, case: str, audio: bytes, rate: float, duration: float,
+                    timeout: float, seed: int) -> CaseResult:
+    result = CaseResult(case, duration)
+    rng = random.Random(seed)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        async def fire():
+            result.samples.append(await send(client, url, case, audio))
+
+        tasks = []
+        started = time.perf_counter()
+        next_arrival = started
+        while next_arrival < started + duration:
+            await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+            tasks.append(asyncio.create_task(fire()))
+            next_arrival += rng.expovariate(rate)
+        await asyncio.gather(*tasks)
+        result.duration = time.perf_counter() - started
+    return result
+
+
+def boot_server(args) -> subprocess.Popen:
+    """Start the stand-in server and wait until it answers."""
+    command = [
+        sys.executable, "-m", "benchmarks.stub_server",
+        "--port", str(args.port),
+        "--llm-latency", str(args.llm_latency),
+        "--output-words", str(args.output_words),
+        "--stt-latency", str(args.stt_latency),
+        "--tts-latency", str(args.tts_latency),
+        "--tts-chunk-delay", str(args.tts_chunk_delay),
+    ]
+    env = dict(os.environ)
+    if args.no_transcript_cache:
+        env["TRANSCRIPT_CACHE_DIR"] = ""
+    process = subprocess.Popen(command, env=env)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Stand-in server exited during startup")
+        try:
+            httpx.get(f"http://127.0.0.1:{args.port}/metrics", timeout=1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Stand-in server did not start within 30s")
+
+
+def print_report(results: List[CaseResult]):
+    header = (f"{'case':<12}{'reqs':>6}{'err%':>7}{'rps':>8}{'p50':>8}{'p95':>8}{'p99':>8}"
+              f"{'ttfb50':>8}{'ttfb95':>8}{'ttfb99':>8}")
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        s = result.summary()
+        print(f"{result.case:<12}{s['requests']:>6}{s['error_rate'] * 100:>6.1f}%{s['throughput_rps']:>8.2f}"
+              f"{s['latency_p50']:>8.3f}{s['latency_p95']:>8.3f}{s['latency_p99']:>8.3f}"
+              f"{s['ttfb_p50']:>8.3f}{s['ttfb_p95']:>8.3f}{s['ttfb_p99']:>8.3f}")
+        errors = {}
+        for sample in result.samples:
+            if not sample.ok:
+                errors[sample.error] = errors.get(sample.error, 0) + 1
+        for error, count in errors.items():
+            print(f"{'':<12}  {count} x {error}")
+    print("\nLatencies in seconds; ttfb = time to first response byte.")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the /blogs endpoint")
+    parser.add_argument("--url", help="Target an already running server instead of booting one")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--cases", default=",".join(CASES), help="Comma-separated subset of " + ",".join(CASES))
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed")
+    parser.add_argument("--concurrency", type=int, default=4, help="Virtual users (closed loop)")
+    parser.add_argument("--rate", type=float, default=2.0, help="Arrivals per second (open loop)")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of load per case")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--mix", action="store_true", help="Run the selected cases concurrently")
+    parser.add_argument("--voice-seconds", type=float, default=4.0)
+    parser.add_argument("--json", dest="json_path", help="Also write summaries to this file")
+    # Stand-in provider behaviour when booting the server
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--output-words", type=int, default=600)
+    parser.add_argument("--stt-latency", type=float, default=1.0)
+    parser.add_argument("--tts-latency", type=float, default=0.3)
+    parser.add_argument("--tts-chunk-delay", type=float, default=0.0)
+    parser.add_argument("--no-transcript-cache", action="store_true",
+                        help="Transcribe every upload (the harness resends the same recording)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    cases = [c for c in args.cases.split(",") if c]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        print(f"Unknown cases: {unknown}")
+        return 2
+
+    with tempfile.TemporaryDirectory() as workdir:
+        wav_path = make_wav(os.path.join(workdir, "prompt.wav"), seconds=args.voice_seconds)
+        with open(wav_path, "rb") as f:
+            audio = f.read()
+
+    server = None if args.url else boot_server(args)
+    url = args.url or f"http://127.0.0.1:{args.port}/blogs"
+    results = []
+    def run(case):
+        if args.mode == "closed":
+            return closed_loop(url, case, audio, args.concurrency, args.duration, args.timeout)
+        return open_loop(url, case, audio, args.rate, args.duration, args.timeout, args.seed)
+
+    async def run_mixed():
+        return await asyncio.gather(*(run(case) for case in cases))
+
+    try:
+        if args.mix:
+            results.extend(asyncio.run(run_mixed()))
+        else:
+            for case in cases:
+                results.append(asyncio.run(run(case)))
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=30)
+
+    print_report(results)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({r.case: r.summary() for r in results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
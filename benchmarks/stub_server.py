@@ -0,0 +1,54 @@
+"""
+Run the real FastAPI app (`app.py`) with the fake providers from
+`benchmarks/fakes.py` registered in place of Groq, AssemblyAI and ElevenLabs.
+
+    python -m benchmarks.stub_server --port 8001 --llm-latency 0.8 --tts-latency 0.3
+"""
+import argparse
+import logging
+
+import uvicorn
+
+from benchmarks.fakes import FakeChatModel, FakeSTT, FakeTTS
+from src.providers.clients import override_providers
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve app.py against local stand-in providers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds per LLM call")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--output-words", type=int, default=600)
+    parser.add_argument("--stt-latency", type=float, default=1.0)
+    parser.add_argument("--stt-latency-per-mb", type=float, default=0.0)
+    parser.add_argument("--tts-latency", type=float, default=0.3, help="Seconds before the first audio chunk")
+    parser.add_argument("--tts-chunk-delay", type=float, default=0.0)
+    parser.add_argument("--tts-bytes-per-char", type=int, default=1000)
+    parser.add_argument("--log-level", default="warning")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.getLogger().setLevel(args.log_level.upper())
+    override_providers(
+        llm=FakeChatModel(
+            latency=args.llm_latency,
+            tokens_per_second=args.tokens_per_second,
+            output_words=args.output_words,
+        ),
+        stt=FakeSTT(latency=args.stt_latency, latency_per_mb=args.stt_latency_per_mb),
+        tts=FakeTTS(
+            latency=args.tts_latency,
+            chunk_delay=args.tts_chunk_delay,
+            bytes_per_char=args.tts_bytes_per_char,
+        ),
+    )
+
+    from app import app
+    uvicorn.run(app, host=args.host, port=args.port, log_level=args.log_level)
+
+
+if __name__ == "__main__":
+    main()
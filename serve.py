@@ -0,0 +1,100 @@
+"""
+Production entry point: runs the FastAPI app in several uvicorn worker
+processes under gunicorn.
+
+The master imports `app.py` and calls `preload()` before forking, so compiled
+graphs, provider clients and imported SDKs are built once and shared
+copy-on-write by every worker. Caches and rate-limit counters live in local
+files (transcript cache, SQLite shared store), so all workers see the same
+state. On SIGTERM, workers stop accepting connections and let in-flight
+requests, including streamed blogs and audio, finish for up to
+GRACEFUL_TIMEOUT seconds.
+
+    python serve.py
+    WEB_CONCURRENCY=8 PORT=8000 GRACEFUL_TIMEOUT=90 python serve.py
+
+`python app.py` remains the single-process development server with reload.
+"""
+import os
+import sys
+import tempfile
+import logging
+import multiprocessing
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Metrics from all workers are aggregated through files in this directory; it must be
+# set before prometheus_client is first imported
+if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="blog-metrics-")
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+HOST = os.getenv("HOST") or "0.0.0.0"
+PORT = int(os.getenv("PORT") or 8000)
+WORKERS = int(os.getenv("WEB_CONCURRENCY") or multiprocessing.cpu_count())
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT") or 60)
+KEEPALIVE = int(os.getenv("KEEPALIVE") or 300)
+
+
+def run_gunicorn(application):
+    from gunicorn.app.base import BaseApplication
+    from uvicorn_worker import UvicornWorker
+
+    class BlogWorker(UvicornWorker):
+        """Uvicorn worker that drains in-flight responses within gunicorn's graceful timeout"""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            # Cancel whatever is still streaming just before gunicorn would SIGKILL the worker
+            self.config.timeout_graceful_shutdown = max(1, self.cfg.graceful_timeout - 1)
+
+    def child_exit(server, worker):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+    class BlogServer(BaseApplication):
+        def __init__(self, app, options):
+            self.application = app
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    BlogServer(application, {
+        "bind": f"{HOST}:{PORT}",
+        "workers": WORKERS,
+        "worker_class": BlogWorker,
+        "preload_app": True,
+        "graceful_timeout": GRACEFUL_TIMEOUT,
+        "timeout": 60,
+        "keepalive": KEEPALIVE,
+        "child_exit": child_exit,
+    }).run()
+
+
+def main():
+    if sys.platform == "win32":
+        # gunicorn needs fork(); uvicorn's own supervisor spawns workers without preloading
+        import uvicorn
+        logger.warning("gunicorn is unavailable on Windows; starting uvicorn workers without preloading")
+        uvicorn.run("app:app", host=HOST, port=PORT, workers=WORKERS,
+                    timeout_keep_alive=KEEPALIVE, timeout_graceful_shutdown=GRACEFUL_TIMEOUT)
+        return
+
+    from app import app, preload
+    preload()
+    logger.info(f"Starting {WORKERS} workers on {HOST}:{PORT}")
+    run_gunicorn(app)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import os
+import math
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import AsyncIterator, Deque, Dict
+
+from src.monitoring.metrics import ADMISSION_ACTIVE, ADMISSION_QUEUE_WAIT, ADMISSION_QUEUED, ADMISSION_REJECTED
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Longest a request may wait in a lane's queue before it is turned away
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT") or 30)
+
+# Per worker process: (concurrent requests, queued requests, typical service seconds)
+LANE_DEFAULTS = {
+    "text": (16, 64, 5.0),          # text -> text: one or two LLM calls
+    "text_voice": (4, 16, 15.0),    # text -> voice: LLM calls plus text-to-speech
+    "voice": (2, 8, 30.0),          # voice -> *: speech-to-text, LLM calls, maybe text-to-speech
+}
+
+
+class LaneFull(Exception):
+    """Raised when a lane cannot admit a request; carries the Retry-After hint in seconds."""
+
+    def __init__(self, lane: str, reason: str, retry_after: int):
+        super().__init__(f"{lane} lane rejected request ({reason})")
+        self.lane = lane
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Lane:
+    """
+    Concurrency limit with a bounded FIFO queue for one workload class.
+    Slots are handed directly from a finishing request to the oldest waiter,
+    so a burst of new arrivals cannot overtake requests already queued.
+    All methods must be called from the worker's event loop.
+    """
+
+    def __init__(self, name: str, concurrency: int, queue_size: int, service_time: float):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # Moving average of slot hold times, used for Retry-After
+        self._service_time = service_time
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue should have drained enough to admit one more request"""
+        rounds = (self.queued + 1) / max(1, self.concurrency)
+        return max(1, math.ceil(rounds * self._service_time))
+
+    def _reject(self, reason: str):
+        ADMISSION_REJECTED.labels(lane=self.name, reason=reason).inc()
+        raise LaneFull(self.name, reason, self.retry_after())
+
+    async def acquire(self) -> float:
+        """Take a slot, queueing if necessary. Returns the acquisition time for release()."""
+        start = time.perf_counter()
+        if self.active < self.concurrency and not self._waiters:
+            self.active += 1
+        else:
+            if len(self._waiters) >= self.queue_size:
+                self._reject("queue_full")
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            ADMISSION_QUEUED.labels(lane=self.name).inc()
+            try:
+                await asyncio.wait_for(waiter, ADMISSION_QUEUE_TIMEOUT)
+            except asyncio.TimeoutError:
+                self._reject("queue_timeout")
+            except asyncio.CancelledError:
+                # The client went away; give back a slot that was handed over in the meantime
+                if waiter.done() and not waiter.cancelled():
+                    self._hand_off()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                ADMISSION_QUEUED.labels(lane=self.name).dec()
+        acquired = time.perf_counter()
+        ADMISSION_QUEUE_WAIT.labels(lane=self.name).observe(acquired - start)
+        ADMISSION_ACTIVE.labels(lane=self.name).inc()
+        return acquired
+
+    def release(self, acquired: float):
+        """Free a slot taken by acquire(), handing it to the oldest waiter if any"""
+        ADMISSION_ACTIVE.labels(lane=self.name).dec()
+        self._service_time = 0.8 * self._service_time + 0.2 * (time.perf_counter() - acquired)
+        self._hand_off()
+
+    def _hand_off(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # the slot moves to the waiter, active is unchanged
+                return
+        self.active -= 1
+
+    async def hold(self, body: AsyncIterator[bytes], acquired: float) -> AsyncIterator[bytes]:
+        """Pass a streamed response body through, keeping the slot until it is fully sent"""
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            self.release(acquired)
+
+
+def _lane_from_env(name: str) -> Lane:
+    concurrency, queue_size, service_time = LANE_DEFAULTS[name]
+    prefix = f"LANE_{name.upper()}"
+    return Lane(
+        name,
+        int(os.getenv(f"{prefix}_CONCURRENCY") or concurrency),
+        int(os.getenv(f"{prefix}_QUEUE") or queue_size),
+        service_time,
+    )
+
+
+LANES: Dict[str, Lane] = {name: _lane_from_env(name) for name in LANE_DEFAULTS}
+
+
+def lane_for(input_type: str, output_type: str) -> Lane:
+    """Workload class of a /blogs request"""
+    if input_type == "voice":
+        return LANES["voice"]
+    if output_type == "voice":
+        return LANES["text_voice"]
+    return LANES["text"]
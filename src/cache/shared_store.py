@@ -0,0 +1,80 @@
+import os
+import time
+import sqlite3
+import logging
+from functools import lru_cache
+
+from src.cache.sqlite_store import SQLiteStore
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SHARED_STORE_PATH = os.getenv("SHARED_STORE_PATH") or ".cache/shared.sqlite3"
+
+
+class SharedStore(SQLiteStore):
+    """
+    Expiring locks and fixed-window counters seen by every worker process
+    on the host.
+    """
+
+    def __init__(self, path: str = SHARED_STORE_PATH):
+        super().__init__(path)
+
+    def create_schema(self, conn: sqlite3.Connection):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS counters ("
+            " key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def claim(self, key: str, owner: bytes, ttl: float) -> bool:
+        """Take a host-wide lock for `ttl` seconds; False while another owner holds it."""
+        now = time.time()
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM kv WHERE expires_at <= ?", (now,))
+            claimed = conn.execute(
+                "INSERT OR IGNORE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, sqlite3.Binary(owner), now + ttl),
+            ).rowcount == 1
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return claimed
+
+    def release(self, key: str, owner: bytes):
+        """Drop a lock taken by claim(), unless it expired and another owner took it since."""
+        self._conn.execute("DELETE FROM kv WHERE key = ? AND value = ?", (key, sqlite3.Binary(owner)))
+
+    def hit(self, key: str, window: float) -> int:
+        """Increment a counter in the current fixed window and return its new value."""
+        now = time.time()
+        bucket = f"{key}:{int(now // window)}"
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO counters (key, count, expires_at) VALUES (?, 1, ?) "
+                "ON CONFLICT(key) DO UPDATE SET count = count + 1",
+                (bucket, (int(now // window) + 1) * window),
+            )
+            count = conn.execute("SELECT count FROM counters WHERE key = ?", (bucket,)).fetchone()[0]
+            conn.execute("DELETE FROM counters WHERE expires_at <= ?", (now,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return count
+
+
+@lru_cache(maxsize=1)
+def get_shared_store() -> SharedStore:
+    """Process-wide handle on the host-wide shared store"""
+    return SharedStore()
@@ -0,0 +1,41 @@
+import os
+import sqlite3
+import threading
+
+
+class SQLiteStore:
+    """
+    Base for stores kept in a local SQLite file in WAL mode, shared by every
+    worker process on the host. Connections are opened lazily per process and
+    thread, which keeps a store safe to create before the server forks its
+    workers. Subclasses create their tables in create_schema().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            self.create_schema(conn)
+        finally:
+            conn.close()
+
+    def create_schema(self, conn: sqlite3.Connection):
+        raise NotImplementedError
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10, isolation_level=None)
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per (process, thread); a connection inherited through fork is never reused
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = self._connect()
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
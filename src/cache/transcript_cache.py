@@ -0,0 +1,73 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Empty string disables the cache
+TRANSCRIPT_CACHE_DIR = os.getenv("TRANSCRIPT_CACHE_DIR", ".cache/transcripts")
+
+
+class TranscriptCache:
+    """
+    On-disk transcripts keyed by the audio content hash plus the settings
+    that influence transcription. One JSON file per entry, written atomically,
+    so several worker processes can share the directory safely.
+    """
+
+    def __init__(self, directory: str = TRANSCRIPT_CACHE_DIR):
+        self.directory = directory
+        self.enabled = bool(directory)
+        if self.enabled:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(audio_sha256: str, settings: Dict[str, Any]) -> str:
+        payload = audio_sha256 + json.dumps(settings, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def contains(self, key: str) -> bool:
+        return self.enabled and os.path.exists(self._path(key))
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)["text"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable transcript cache entry {key}: {e}")
+            return None
+
+    def set(self, key: str, text: str):
+        if not self.enabled:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"text": text, "created": time.time()}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write transcript cache entry {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+@lru_cache(maxsize=1)
+def get_transcript_cache() -> TranscriptCache:
+    """Process-wide transcript cache"""
+    return TranscriptCache()
@@ -0,0 +1,127 @@
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import difflib
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from src.cache.sqlite_store import SQLiteStore
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Empty string disables the translation memory
+TRANSLATION_MEMORY_PATH = os.getenv("TRANSLATION_MEMORY_PATH", ".cache/translation_memory.sqlite3")
+# Similarity (0-1) a stored segment needs to be offered as a fuzzy suggestion; 0 disables suggestions
+TRANSLATION_MEMORY_FUZZY = float(os.getenv("TRANSLATION_MEMORY_FUZZY") or 0.85)
+# Stored segments compared per lookup when searching for fuzzy matches
+FUZZY_CANDIDATES = 200
+
+
+class TranslationMemory(SQLiteStore):
+    """
+    Source -> target segment pairs per target language, shared by all workers.
+    Exact matches are looked up by the hash of the whitespace-normalized
+    source; fuzzy matches compare against stored segments of similar length.
+    """
+
+    def __init__(self, path: str = TRANSLATION_MEMORY_PATH, fuzzy_threshold: float = TRANSLATION_MEMORY_FUZZY):
+        self.enabled = bool(path)
+        self.fuzzy_threshold = fuzzy_threshold
+        if self.enabled:
+            super().__init__(path)
+        else:
+            self.path = path
+
+    def create_schema(self, conn: sqlite3.Connection):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS segments ("
+            " language TEXT NOT NULL, source_hash TEXT NOT NULL, source TEXT NOT NULL,"
+            " target TEXT NOT NULL, length INTEGER NOT NULL, uses INTEGER NOT NULL DEFAULT 0,"
+            " updated REAL NOT NULL, PRIMARY KEY (language, source_hash))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS segments_length ON segments (language, length)")
+
+    @staticmethod
+    def normalize(segment: str) -> str:
+        return " ".join(segment.split())
+
+    @classmethod
+    def key(cls, segment: str) -> str:
+        return hashlib.sha256(cls.normalize(segment).encode("utf-8")).hexdigest()
+
+    def lookup(self, language: str, segments: List[str]) -> Dict[str, str]:
+        """Stored translations of the given segments, keyed by segment text (exact matches only)"""
+        if not self.enabled or not segments:
+            return {}
+        keys = {self.key(segment): segment for segment in segments}
+        found: Dict[str, str] = {}
+        placeholders = ",".join("?" * len(keys))
+        rows = self._conn.execute(
+            f"SELECT source_hash, target FROM segments WHERE language = ? AND source_hash IN ({placeholders})",
+            (language, *keys),
+        ).fetchall()
+        for source_hash, target in rows:
+            found[keys[source_hash]] = target
+        if rows:
+            used = [row[0] for row in rows]
+            self._conn.execute(
+                f"UPDATE segments SET uses = uses + 1 WHERE language = ? AND source_hash IN ({','.join('?' * len(used))})",
+                (language, *used),
+            )
+        return found
+
+    def suggest(self, language: str, segment: str) -> Optional[Tuple[str, str]]:
+        """Closest stored (source, target) pair above the fuzzy threshold, if any"""
+        if not self.enabled or not self.fuzzy_threshold:
+            return None
+        normalized = self.normalize(segment)
+        # Two strings can only reach ratio r if their lengths are within that ratio of each other
+        low = int(len(normalized) * self.fuzzy_threshold)
+        high = int(len(normalized) / self.fuzzy_threshold) + 1
+        rows = self._conn.execute(
+            "SELECT source, target FROM segments WHERE language = ? AND length BETWEEN ? AND ? "
+            "ORDER BY uses DESC LIMIT ?",
+            (language, low, high, FUZZY_CANDIDATES),
+        ).fetchall()
+        best, best_ratio = None, self.fuzzy_threshold
+        matcher = difflib.SequenceMatcher(b=normalized, autojunk=False)
+        for source, target in rows:
+            matcher.set_seq1(source)
+            if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = (source, target), ratio
+        return best
+
+    def store(self, language: str, pairs: Dict[str, str]):
+        if not self.enabled or not pairs:
+            return
+        now = time.time()
+        rows = [
+            (language, self.key(source), self.normalize(source), target, len(self.normalize(source)), now)
+            for source, target in pairs.items()
+        ]
+        conn = self._conn
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR REPLACE INTO segments (language, source_hash, source, target, length, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.warning(f"Could not update translation memory: {e}")
+
+
+@lru_cache(maxsize=1)
+def get_translation_memory() -> TranslationMemory:
+    """Process-wide translation memory"""
+    return TranslationMemory()
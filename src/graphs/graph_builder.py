@@ -1,44 +1,45 @@
 from langgraph.graph import StateGraph, START, END
-from src.llms.groqllm import GroqLLM
 from src.states.blogstate import BlogState, Language
 from src.nodes.blog_node import BlogNode
-from pydub import AudioSegment
+from src.monitoring.metrics import instrument_node
+from src.nodes.cancellation import cancellable
+from src.providers.clients import get_llm
 import os
 from typing import Dict, Any
 
-# Configure audio converter path
-AudioSegment.converter = "C:\\ffmpeg\\bin\\ffmpeg.exe"  # replace path if different
-
 class GraphBuilder:
     """Builds and configures blog generation workflows based on use cases."""
     
-    def __init__(self, llm):
+    def __init__(self, llm, stt_client=None, tts_client=None, translation_memory=None):
         self.llm = llm
         self.graph = StateGraph(BlogState)
-        self.blog_node = BlogNode(self.llm)
+        self.blog_node = BlogNode(
+            self.llm, stt_client=stt_client, tts_client=tts_client, translation_memory=translation_memory
+        )
         self._reset_graph()
 
     def _reset_graph(self):
         """Reset the graph for new workflow construction"""
         self.graph = StateGraph(BlogState)
 
+    def _add_node(self, name: str, fn):
+        """Add a node wrapped with latency/token instrumentation and request cancellation"""
+        self.graph.add_node(name, cancellable(instrument_node(name, fn)))
+
     def _add_translation_nodes(self):
         """Add language translation nodes to the graph"""
         for lang in Language:
-            self.graph.add_node(
+            self._add_node(
                 f"{lang.value}_translation",
-                lambda state, lang=lang: self.blog_node.translation({
-                    **state,
-                    "current_language": lang.value
-                })
+                lambda state, lang=lang: self.blog_node.translation(state, lang.value)
             )
 
     def build_topic_graph(self) -> StateGraph:
         """Build basic topic-to-blog workflow"""
         self._reset_graph()
         
-        self.graph.add_node("title_creation", self.blog_node.title_creation)
-        self.graph.add_node("content_generation", self.blog_node.content_generation)
+        self._add_node("title_creation", self.blog_node.title_creation)
+        self._add_node("content_generation", self.blog_node.content_generation)
 
         self.graph.add_edge(START, "title_creation")
         self.graph.add_edge("title_creation", "content_generation")
@@ -50,9 +51,9 @@ class GraphBuilder:
         """Build workflow with language translation support"""
         self._reset_graph()
         
-        self.graph.add_node("title_creation", self.blog_node.title_creation)
-        self.graph.add_node("content_generation", self.blog_node.content_generation)
-        self.graph.add_node("route", self.blog_node.route)
+        self._add_node("title_creation", self.blog_node.title_creation)
+        self._add_node("content_generation", self.blog_node.content_generation)
+        self._add_node("route", self.blog_node.route)
 
         self._add_translation_nodes()
 
@@ -79,16 +80,23 @@ class GraphBuilder:
         self._reset_graph()
         
         # Add core nodes
-        self.graph.add_node("voice_input", self.blog_node.voice_input_node)
-        self.graph.add_node("title_creation", self.blog_node.title_creation)
-        self.graph.add_node("content_generation", self.blog_node.content_generation)
-        self.graph.add_node("route", self.blog_node.route)
-        self.graph.add_node("voice_output", self.blog_node.voice_output_node)
+        self._add_node("audio_preprocessing", self.blog_node.audio_preprocessing_node)
+        self._add_node("voice_input", self.blog_node.voice_input_node)
+        self._add_node("title_creation", self.blog_node.title_creation)
+        self._add_node("content_generation", self.blog_node.content_generation)
+        self._add_node("route", self.blog_node.route)
+        self._add_node("voice_output", self.blog_node.voice_output_node)
 
         self._add_translation_nodes()
 
         # Define workflow edges
-        self.graph.add_edge(START, "voice_input")
+        # Recordings transcribed before skip preprocessing and speech-to-text
+        self.graph.add_conditional_edges(
+            START,
+            self.blog_node.transcript_cache_decision,
+            {"cached": "voice_input", "transcribe": "audio_preprocessing"}
+        )
+        self.graph.add_edge("audio_preprocessing", "voice_input")
         self.graph.add_edge("voice_input", "title_creation")
         self.graph.add_edge("title_creation", "content_generation")
         self.graph.add_edge("content_generation", "route")
@@ -100,20 +108,37 @@ class GraphBuilder:
             {lang.value: f"{lang.value}_translation" for lang in Language}
         )
 
-        # Connect translations to voice output
+        # Connect translations to voice output, unless the caller synthesizes audio itself
         for lang in Language:
-            self.graph.add_edge(f"{lang.value}_translation", "voice_output")
+            self.graph.add_conditional_edges(
+                f"{lang.value}_translation",
+                self.blog_node.audio_decision,
+                {"synthesize": "voice_output", "skip": END}
+            )
         
         self.graph.add_edge("voice_output", END)
 
         return self.graph
 
+    def build_revision_graph(self) -> StateGraph:
+        """Build workflow that regenerates selected sections of a stored blog"""
+        self._reset_graph()
+
+        self._add_node("section_revision", self.blog_node.section_revision)
+        self._add_node("section_translation", self.blog_node.section_translation)
+
+        self.graph.add_edge(START, "section_revision")
+        self.graph.add_edge("section_revision", "section_translation")
+        self.graph.add_edge("section_translation", END)
+
+        return self.graph
+
     def setup_graph(self, usecase: str) -> Any:
         """
         Configure and compile the appropriate workflow graph.
         
         Args:
-            usecase: One of 'topic', 'language', or 'voice'
+            usecase: One of 'topic', 'language', 'voice', or 'revision'
             
         Returns:
             Compiled graph ready for execution
@@ -125,15 +150,32 @@ class GraphBuilder:
             graph = self.build_language_graph()
         elif usecase == "voice":
             graph = self.build_voice_graph()
+        elif usecase == "revision":
+            graph = self.build_revision_graph()
         else:
-            raise ValueError(f"Invalid usecase: {usecase}. Must be 'topic', 'language', or 'voice'")
+            raise ValueError(f"Invalid usecase: {usecase}. Must be 'topic', 'language', 'voice', or 'revision'")
 
         return graph.compile()
 
 
+def __getattr__(name: str) -> Any:
+    """
+    Module-level `graph` entry point referenced by langgraph.json.
+
+    Compiled on first access rather than at import, so importing GraphBuilder
+    stays cheap. LANGGRAPH_USECASE selects the workflow (default: 'language').
+    """
+    if name == "graph":
+        usecase = os.getenv("LANGGRAPH_USECASE", "language")
+        compiled = GraphBuilder(get_llm()).setup_graph(usecase)
+        globals()["graph"] = compiled
+        return compiled
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == "__main__":
     # Test the voice workflow
-    llm = GroqLLM().get_llm()
+    llm = get_llm()
     graph_builder = GraphBuilder(llm)
     graph = graph_builder.setup_graph("voice")
     print("Voice workflow graph compiled successfully")
\ No newline at end of file
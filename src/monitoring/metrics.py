@@ -0,0 +1,186 @@
+import os
+import time
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+from prometheus_client import Counter, Gauge, Histogram, CollectorRegistry, CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client import multiprocess
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+REQUEST_LATENCY = Histogram(
+    "blog_request_duration_seconds",
+    "Time spent handling a /blogs request until the response starts",
+    ["input_type", "output_type", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+NODE_LATENCY = Histogram(
+    "blog_node_duration_seconds",
+    "Time spent inside a graph node",
+    ["node"],
+    buckets=LATENCY_BUCKETS,
+)
+PROVIDER_LATENCY = Histogram(
+    "blog_provider_duration_seconds",
+    "Time spent waiting on an external provider call",
+    ["provider", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "blog_llm_tokens_total",
+    "LLM tokens consumed, by operation and direction (input/output)",
+    ["operation", "direction"],
+)
+TTS_CHARACTERS = Counter(
+    "blog_tts_characters_total",
+    "Characters sent to text-to-speech",
+    ["provider"],
+)
+STT_AUDIO_BYTES = Counter(
+    "blog_stt_audio_bytes_total",
+    "Voice input bytes as received and as uploaded to speech-to-text",
+    ["stage"],
+)
+CACHE_REQUESTS = Counter(
+    "blog_cache_requests_total",
+    "Cache lookups, by cache and result (hit/miss)",
+    ["cache", "result"],
+)
+ADMISSION_QUEUE_WAIT = Histogram(
+    "blog_admission_queue_wait_seconds",
+    "Time an admitted request waited in its lane's queue before starting",
+    ["lane"],
+    buckets=LATENCY_BUCKETS,
+)
+ADMISSION_REJECTED = Counter(
+    "blog_admission_rejected_total",
+    "Requests turned away by admission control, by lane and reason (queue_full/queue_timeout)",
+    ["lane", "reason"],
+)
+ADMISSION_ACTIVE = Gauge(
+    "blog_admission_active",
+    "Requests currently holding a slot in their lane",
+    ["lane"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUED = Gauge(
+    "blog_admission_queued",
+    "Requests currently waiting for a slot in their lane",
+    ["lane"],
+    multiprocess_mode="livesum",
+)
+CANCELLED = Counter(
+    "blog_cancelled_total",
+    "Requests whose remaining work was cancelled, by reason (disconnect/deadline)",
+    ["reason"],
+)
+ERRORS = Counter(
+    "blog_errors_total",
+    "Errors raised by nodes, providers and request handling",
+    ["component"],
+)
+
+# Token usage of the node currently executing, merged into its state update
+_node_usage: ContextVar[Optional[Dict[str, int]]] = ContextVar("node_usage", default=None)
+
+
+@contextmanager
+def track_provider(provider: str, operation: str):
+    """Time an external provider call and count its failures."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        ERRORS.labels(component=f"provider:{provider}").inc()
+        raise
+    finally:
+        PROVIDER_LATENCY.labels(provider=provider, operation=operation).observe(time.perf_counter() - start)
+
+
+def record_llm_usage(operation: str, message: Any):
+    """Count the tokens reported in an LLM response's usage metadata."""
+    usage = getattr(message, "usage_metadata", None) or {}
+    input_tokens = usage.get("input_tokens", 0)
+    output_tokens = usage.get("output_tokens", 0)
+    LLM_TOKENS.labels(operation=operation, direction="input").inc(input_tokens)
+    LLM_TOKENS.labels(operation=operation, direction="output").inc(output_tokens)
+
+    node_usage = _node_usage.get()
+    if node_usage is not None:
+        node_usage["input_tokens"] = node_usage.get("input_tokens", 0) + input_tokens
+        node_usage["output_tokens"] = node_usage.get("output_tokens", 0) + output_tokens
+
+
+def record_tts_characters(provider: str, text: str):
+    TTS_CHARACTERS.labels(provider=provider).inc(len(text))
+
+
+def record_stt_audio(received_bytes: int, uploaded_bytes: int):
+    STT_AUDIO_BYTES.labels(stage="received").inc(received_bytes)
+    STT_AUDIO_BYTES.labels(stage="uploaded").inc(uploaded_bytes)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def instrument_node(name: str, fn: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Callable:
+    """
+    Wrap a graph node so its latency, errors and token usage are recorded
+    both in Prometheus and in the state fields reserved for them.
+    """
+    def wrapper(state: Dict[str, Any]) -> Dict[str, Any]:
+        usage: Dict[str, int] = {}
+        token = _node_usage.set(usage)
+        start = time.perf_counter()
+        try:
+            update = fn(state)
+        except Exception:
+            ERRORS.labels(component=f"node:{name}").inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            _node_usage.reset(token)
+            NODE_LATENCY.labels(node=name).observe(elapsed)
+
+        update = dict(update or {})
+        update["processing_steps"] = list(state.get("processing_steps") or []) + [name]
+        update["processing_time"] = (state.get("processing_time") or 0.0) + elapsed
+        update["node_timings"] = {**(state.get("node_timings") or {}), name: elapsed}
+        if usage:
+            totals = dict(state.get("token_usage") or {})
+            for key, value in usage.items():
+                totals[key] = totals.get(key, 0) + value
+            update["token_usage"] = totals
+        return update
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+def processing_summary(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the instrumentation fields of a finished run for API responses."""
+    return {
+        "processing_time": state.get("processing_time"),
+        "processing_steps": state.get("processing_steps") or [],
+        "node_timings": state.get("node_timings") or {},
+        "token_usage": state.get("token_usage") or {},
+        "api_used": state.get("api_used"),
+        "warnings": state.get("warnings") or [],
+    }
+
+
+def render_latest():
+    """Return the Prometheus exposition payload and its content type."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # Several worker processes (serve.py): aggregate their metric files
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,72 @@
+import os
+import logging
+from typing import Dict, Any
+
+from src.providers.clients import get_audio_segment
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Speech-to-text only needs narrowband mono audio; 16 kHz is what STT models run at
+STT_SAMPLE_RATE = int(os.getenv("STT_SAMPLE_RATE") or 16000)
+STT_AUDIO_FORMAT = os.getenv("STT_AUDIO_FORMAT") or "ogg"     # ogg (Opus) or wav
+STT_AUDIO_BITRATE = os.getenv("STT_AUDIO_BITRATE") or "24k"   # Opus is transparent for speech at 24k
+SILENCE_MARGIN_DB = 16    # anything this far below the clip's average loudness counts as silence
+SILENCE_PADDING_MS = 200  # keep a little air so the first/last word is not clipped
+
+
+def stt_settings() -> Dict[str, Any]:
+    """Preprocessing settings that change what speech-to-text receives (part of cache keys)."""
+    return {"sample_rate": STT_SAMPLE_RATE, "format": STT_AUDIO_FORMAT, "bitrate": STT_AUDIO_BITRATE}
+
+
+def _trim_silence(segment):
+    """Drop leading and trailing silence from a pydub AudioSegment."""
+    from pydub.silence import detect_leading_silence
+
+    if segment.dBFS == float("-inf"):  # digital silence, nothing to keep
+        return segment
+    threshold = segment.dBFS - SILENCE_MARGIN_DB
+    start = detect_leading_silence(segment, silence_threshold=threshold)
+    end = detect_leading_silence(segment.reverse(), silence_threshold=threshold)
+    start = max(0, start - SILENCE_PADDING_MS)
+    end = max(0, end - SILENCE_PADDING_MS)
+    if start + end >= len(segment):
+        return segment
+    return segment[start:len(segment) - end]
+
+
+def preprocess_for_stt(path: str) -> Dict[str, Any]:
+    """
+    Downmix to mono, resample to STT_SAMPLE_RATE, trim silence and encode
+    compactly. Writes `<path>.stt.<ext>` next to the input and returns its path
+    together with the before/after sizes.
+    """
+    AudioSegment = get_audio_segment()
+    segment = AudioSegment.from_file(path)
+    original_ms = len(segment)
+
+    segment = _trim_silence(segment.set_channels(1).set_frame_rate(STT_SAMPLE_RATE))
+
+    output_path = f"{path}.stt.{STT_AUDIO_FORMAT}"
+    try:
+        if STT_AUDIO_FORMAT == "ogg":
+            segment.export(output_path, format="ogg", codec="libopus", bitrate=STT_AUDIO_BITRATE)
+        else:
+            segment.export(output_path, format=STT_AUDIO_FORMAT)
+    except Exception as e:
+        # Encoding needs ffmpeg; 16 kHz mono PCM is written natively and is still far smaller
+        logger.warning(f"Could not encode {STT_AUDIO_FORMAT} ({e}), falling back to 16-bit WAV")
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        output_path = f"{path}.stt.wav"
+        segment.set_sample_width(2).export(output_path, format="wav")
+
+    return {
+        "path": output_path,
+        "input_bytes": os.path.getsize(path),
+        "output_bytes": os.path.getsize(output_path),
+        "input_ms": original_ms,
+        "output_ms": len(segment),
+    }
@@ -1,31 +1,99 @@
 from src.states.blogstate import BlogState, Language
-from langchain_core.messages import SystemMessage, HumanMessage
-import assemblyai as aai
-import os
-import requests
-from pydub import AudioSegment
-from typing import Dict, Any
+from langchain_core.messages import AIMessageChunk, SystemMessage, HumanMessage
+from typing import Dict, Any, List, Optional
 import logging
-from elevenlabs.client import ElevenLabs
-#from elevenlabs import generate, save, Voice, VoiceSettings
-
-
-# Configure audio converter path
-AudioSegment.converter = "C:\\ffmpeg\\bin\\ffmpeg.exe"  # replace path if different
+from src.monitoring.metrics import (
+    track_provider, record_llm_usage, record_tts_characters, record_stt_audio, record_cache
+)
+from src.providers.clients import get_stt_client, get_tts_client
+from src.nodes.audio import preprocess_for_stt, stt_settings
+from src.nodes.sections import (
+    format_segments, heading, join_sections, normalize_section, parse_segments, replace_segments,
+    split_sections, split_segments, word_count
+)
+from src.cache.transcript_cache import TranscriptCache, get_transcript_cache
+from src.cache.translation_memory import TranslationMemory, get_translation_memory
+from src.storage.artifact_store import ArtifactStore, get_artifact_store
+from src.nodes.cancellation import check_cancelled, current_token, iter_cancellable
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# LLM tag on segment-translation requests; their marker-laden tokens are not streamed to clients
+SEGMENT_TAG = "translation_segments"
+
 class BlogNode:
     """Handles blog generation pipeline including text and voice processing."""
     
-    def __init__(self, llm):
+    def __init__(self, llm, stt_client=None, tts_client=None, transcript_cache: Optional[TranscriptCache] = None,
+                 translation_memory: Optional[TranslationMemory] = None,
+                 artifact_store: Optional[ArtifactStore] = None):
         self.llm = llm
-        aai.settings.api_key = os.getenv("ASSEMBLYAI_API_KEY")
-        self.assemblyai_client = aai
+        # Speech clients are resolved lazily so text-only graphs never load the voice SDKs
+        self.assemblyai_client = stt_client
         self.supported_languages = [lang.value for lang in Language]
-        self.elevenlabs_client = None 
+        self.elevenlabs_client = tts_client
+        self.transcript_cache = transcript_cache or get_transcript_cache()
+        self.translation_memory = translation_memory or get_translation_memory()
+        # Synthesized audio is written here and only its reference enters the state
+        self.artifact_store = artifact_store
+
+    def _invoke_llm(self, operation: str, prompt, tags: Optional[List[str]] = None):
+        """Invoke the LLM with latency and token accounting."""
+        config = {"tags": tags} if tags else None
+        token = current_token()
+        with track_provider("groq", operation):
+            if token is None:
+                response = self.llm.invoke(prompt, config=config)
+            else:
+                # Stream so a cancelled request stops generating between tokens
+                response = AIMessageChunk(content="")
+                for chunk in iter_cancellable(self.llm.stream(prompt, config=config), token):
+                    response += chunk
+        record_llm_usage(operation, response)
+        return response
+
+    def _batch_llm(self, operation: str, prompts: List[Any]) -> List[Any]:
+        """Run independent prompts concurrently, timed as one provider call."""
+        check_cancelled()
+        with track_provider("groq", operation):
+            responses = self.llm.batch(prompts)
+        for response in responses:
+            record_llm_usage(operation, response)
+        return responses
+
+    def _transcript_key(self, state: BlogState) -> Optional[str]:
+        """Cache key for the uploaded audio, or None when its hash is unknown."""
+        audio_sha256 = state.get("voice_input_sha256")
+        if not audio_sha256:
+            return None
+        return TranscriptCache.key(audio_sha256, {"provider": "assemblyai", **stt_settings()})
+
+    def transcript_cache_decision(self, state: BlogState) -> str:
+        """Skip preprocessing and upload when this recording was transcribed before."""
+        key = self._transcript_key(state)
+        return "cached" if key and self.transcript_cache.contains(key) else "transcribe"
+
+    def audio_preprocessing_node(self, state: BlogState) -> Dict[str, Any]:
+        """Shrink the recording before upload: mono, 16 kHz, silence trimmed, compressed."""
+        voice_path = state.get("voice_input_path")
+        if not voice_path:
+            raise ValueError("Missing voice_input_path in state")
+
+        try:
+            stats = preprocess_for_stt(str(voice_path))
+        except Exception as e:
+            # The original upload is still valid input for transcription
+            logger.warning(f"Audio preprocessing failed, uploading original: {e}")
+            return {"warnings": list(state.get("warnings") or []) + [f"Audio preprocessing skipped: {e}"]}
+
+        record_stt_audio(stats["input_bytes"], stats["output_bytes"])
+        logger.info(
+            f"Preprocessed audio {stats['input_bytes']} -> {stats['output_bytes']} bytes, "
+            f"{stats['input_ms']} -> {stats['output_ms']} ms"
+        )
+        return {"voice_input_path": stats["path"]}
 
     def voice_input_node(self, state: BlogState) -> Dict[str, Any]:
         """Transcribe voice file to text using AssemblyAI."""
@@ -33,11 +101,26 @@ class BlogNode:
         if not voice_path:
             raise ValueError("Missing voice_input_path in state")
 
+        key = self._transcript_key(state)
+        if key:
+            cached = self.transcript_cache.get(key)
+            record_cache("transcript", cached is not None)
+            if cached is not None:
+                logger.info(f"Transcript cache hit: {len(cached)} characters")
+                return {
+                    "topic": cached,
+                    "voice_transcript": cached,
+                    "language": state.get("language", "english")
+                }
+
         try:
             logger.info(f"Starting transcription for {voice_path}")
-            transcriber = self.assemblyai_client.Transcriber()
-            transcript = transcriber.transcribe(voice_path)
+            transcriber = (self.assemblyai_client or get_stt_client()).Transcriber()
+            with track_provider("assemblyai", "transcribe"):
+                transcript = transcriber.transcribe(voice_path)
             logger.info(f"Transcription complete: {len(transcript.text)} characters")
+            if key and transcript.text:
+                self.transcript_cache.set(key, transcript.text)
             
             return {
                 "topic": transcript.text,
@@ -62,7 +145,7 @@ class BlogNode:
         Return ONLY the title text without any additional commentary.
         """
         
-        response = self.llm.invoke(prompt)
+        response = self._invoke_llm("title", prompt)
         return {"blog": {"title": response.content.strip()}}
 
     def content_generation(self, state: BlogState) -> Dict[str, Any]:
@@ -85,22 +168,16 @@ class BlogNode:
         - Maintain professional but accessible tone
         """
         
-        response = self.llm.invoke(prompt)
+        response = self._invoke_llm("content", prompt)
         return {
             "blog": {
                 "title": state['blog']['title'],
                 "content": response.content
-            }
+            },
+            "source_content": response.content
         }
 
-    def translation(self, state: BlogState) -> Dict[str, Any]:
-        """Translate blog content to target language."""
-        target_lang = state.get("current_language", "english")
-        content = state.get("blog", {}).get("content", "")
-        
-        if not content:
-            return {}
-            
+    def _translation_messages(self, content: str, target_lang: str) -> List[Any]:
         translation_prompt = f"""
         Translate this blog post to {target_lang} while:
         - Preserving markdown formatting
@@ -112,25 +189,171 @@ class BlogNode:
         {content}
         """
         
-        messages = [
+        return [
+            SystemMessage(content=f"You are a professional {target_lang} translator."),
+            HumanMessage(content=translation_prompt)
+        ]
+
+    def _segment_messages(self, segments: List[str], target_lang: str) -> List[Any]:
+        hints = []
+        for segment in segments:
+            suggestion = self.translation_memory.suggest(target_lang, segment)
+            if suggestion:
+                hints.append(f"{suggestion[0]} => {suggestion[1]}")
+        hint_block = (
+            "Earlier translations of similar segments, for consistent wording:\n" + "\n".join(hints) + "\n\n"
+            if hints else ""
+        )
+        translation_prompt = f"""
+        Translate each numbered segment of a blog post to {target_lang} while:
+        - Preserving inline markdown (bold, italics, links, code)
+        - Maintaining technical accuracy
+        - Adapting cultural references appropriately
+        - Keeping every <<<SEG n>>> marker line exactly as given, each followed by its translation on one line
+        Return only the markers and translations, without commentary.
+
+        {hint_block}Segments to translate:
+        {format_segments(segments)}
+        """
+
+        return [
             SystemMessage(content=f"You are a professional {target_lang} translator."),
             HumanMessage(content=translation_prompt)
         ]
+
+    def _translate_whole(self, contents: List[str], target_lang: str) -> List[str]:
+        """Translate complete texts, one request per text."""
+        messages = [self._translation_messages(content, target_lang) for content in contents]
+        if len(messages) == 1:
+            return [self._invoke_llm("translation", messages[0]).content]
+        return [response.content for response in self._batch_llm("translation", messages)]
+
+    def _translate_texts(self, contents: List[str], target_lang: str) -> List[str]:
+        """
+        Translate Markdown texts through the translation memory: segments
+        translated before are reused, the rest go to the LLM in one request
+        and are remembered for next time.
+        """
+        if not self.translation_memory.enabled:
+            return self._translate_whole(contents, target_lang)
+
+        split = [split_segments(content) for content in contents]
+        unique = list(dict.fromkeys(segment[2] for segments in split for segment in segments))
+        translations = self.translation_memory.lookup(target_lang, unique)
+        for segment in unique:
+            record_cache("translation_memory", segment in translations)
+        missing = [segment for segment in unique if segment not in translations]
+        logger.info(f"Translation memory: {len(unique) - len(missing)}/{len(unique)} segments reused")
+
+        if missing:
+            response = self._invoke_llm(
+                "translation", self._segment_messages(missing, target_lang), tags=[SEGMENT_TAG]
+            )
+            parsed = parse_segments(response.content)
+            new = {segment: parsed.get(number) for number, segment in enumerate(missing, 1)}
+            if not all(new.values()):
+                # The model merged or dropped markers; translating whole texts is still correct
+                logger.warning(
+                    f"Segment translation returned {len(parsed)} of {len(missing)} segments; "
+                    f"translating whole text instead"
+                )
+                return self._translate_whole(contents, target_lang)
+            self.translation_memory.store(target_lang, new)
+            translations.update(new)
+
+        return [replace_segments(content, segments, translations) for content, segments in zip(contents, split)]
+
+    def translation(self, state: BlogState, target_lang: Optional[str] = None) -> Dict[str, Any]:
+        """Translate blog content to target language (default: the state's current_language)."""
+        target_lang = target_lang or state.get("current_language", "english")
+        content = state.get("blog", {}).get("content", "")
         
+        if not content:
+            return {}
+            
         try:
-            translation_result = self.llm.invoke(messages)
+            translated = self._translate_texts([content], target_lang)[0]
             return {
                 "blog": {
                     "title": state['blog']['title'],
-                    "content": translation_result.content
+                    "content": translated
                 }
             }
         except Exception as e:
             logger.error(f"Translation failed: {e}")
             raise
 
+    def section_revision(self, state: BlogState) -> Dict[str, Any]:
+        """Rewrite only the requested sections of the stored draft."""
+        sources = list(state.get("source_sections") or [])
+        revise = state.get("revise_sections") or []
+        if not sources or not revise:
+            return {}
+
+        language = state.get("language", "english")
+        tone = state.get("tone") or "professional"
+        outline = "\n".join(f"- {heading(section)}" for section in sources)
+        total_words = sum(word_count(section) for section in sources) or 1
+        instructions = state.get("revision_instructions")
+
+        prompts = []
+        for index in revise:
+            # Each section keeps its share of the requested overall length
+            words = max(30, round(state.get("length", total_words) * word_count(sources[index]) / total_words))
+            prompts.append(f"""
+        You are an expert blog writer revising one section of an existing blog post.
+        Write in {language} using Markdown formatting.
+        Topic: {state.get('topic', '')}
+        Title: {state.get('blog', {}).get('title', '')}
+        Outline of the whole post:
+        {outline}
+
+        Requirements:
+        - Rewrite only the section below, in a {tone} tone, in about {words} words
+        - Keep its heading line; use ### for any subheadings
+        - Return only the revised section, without commentary
+        {f"- Editor's instructions: {instructions}" if instructions else ""}
+
+        Section to revise:
+        {sources[index]}
+        """)
+
+        responses = self._batch_llm("section_revision", prompts)
+        for index, response in zip(revise, responses):
+            sources[index] = normalize_section(response.content, sources[index], index == len(sources) - 1)
+        return {"source_sections": sources, "source_content": join_sections(sources)}
+
+    def section_translation(self, state: BlogState) -> Dict[str, Any]:
+        """Translate the revised sections, reusing the stored translations of untouched ones."""
+        sources = state.get("source_sections") or []
+        sections = list(state.get("sections") or [])
+        revise = state.get("revise_sections") or []
+        target_lang = state.get("current_language", "english")
+        if not sources:
+            return {}
+
+        if not state.get("translate"):
+            # Blogs that skipped translation publish the draft itself
+            sections = list(sources)
+        elif len(sections) == len(sources):
+            translated = self._translate_texts([sources[index] for index in revise], target_lang)
+            for index, content in zip(revise, translated):
+                sections[index] = normalize_section(content, sources[index], index == len(sources) - 1)
+        else:
+            # The stored translation does not line up with the draft's sections
+            sections = split_sections(self._translate_texts([join_sections(sources)], target_lang)[0])
+
+        return {
+            "sections": sections,
+            "blog": {"title": state.get("blog", {}).get("title", ""), "content": join_sections(sections)}
+        }
+
+    def audio_decision(self, state: BlogState) -> str:
+        """Skip speech synthesis when the caller produces the audio itself."""
+        return "synthesize" if state.get("synthesize_audio", True) else "skip"
+
     def voice_output_node(self, state: BlogState) -> Dict[str, Any]:
-        """Convert blog content to speech using ElevenLabs API and save locally."""
+        """Convert blog content to speech using ElevenLabs API and store it as an artifact."""
         content = state.get("blog", {}).get("content", "")
         if not content:
             logger.warning("No content available for voice generation")
@@ -138,33 +361,32 @@ class BlogNode:
 
         try:
             # Initialize ElevenLabs client
-            client = ElevenLabs(api_key=os.getenv("ELEVENLABS_API_KEY"))
-        
-        # Generate audio using the correct API method
-            audio = client.text_to_speech.convert(
-            text=content,
-            voice_id="EXAVITQu4vr4xnSDxMaL",  # Rachel's voice ID
-            model_id="eleven_monolingual_v2",
-            output_format="mp3_44100_128"
-        )
-        
-        # Save to file
-            output_path = "temp_audio_output.mp3"
-            with open(output_path, "wb") as f:
-                f.write(audio)
-            
+            client = self.elevenlabs_client or get_tts_client()
+            store = self.artifact_store or get_artifact_store()
+
+            # convert() streams the MP3 back as chunks; they go straight to disk
+            record_tts_characters("elevenlabs", content)
+            with track_provider("elevenlabs", "tts"):
+                audio = client.text_to_speech.convert(
+                    text=content,
+                    voice_id="EXAVITQu4vr4xnSDxMaL",  # Rachel's voice ID
+                    model_id="eleven_monolingual_v2",
+                    output_format="mp3_44100_128"
+                )
+                audio_ref = store.put_stream(iter_cancellable([audio] if isinstance(audio, bytes) else audio))
+
             return {
-            "voice_output": output_path,
-            "current_language": state.get("current_language")
-        }
+                "voice_output_audio": audio_ref,
+                "api_used": "elevenlabs"
+            }
         except Exception as e:
             logger.error(f"Voice generation failed: {e}", exc_info=True)
             return {"error": str(e)}
 
     def route(self, state: BlogState) -> Dict[str, Any]:
-        """Pass-through node for logging."""
+        """Pass-through node for logging; changes nothing in the state."""
         logger.info(f"Routing state with language: {state.get('language')}")
-        return state
+        return {}
 
     def route_decision(self, state: BlogState) -> str:
         """Determine which translation branch to take."""
@@ -0,0 +1,119 @@
+import time
+import logging
+import threading
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from langchain_core.runnables import RunnableConfig
+
+from src.monitoring.metrics import CANCELLED
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Key of the request's CancelToken in a graph run's config["configurable"]
+CONFIG_KEY = "cancel_token"
+
+# Token of the request whose graph node is currently executing
+_current_token: ContextVar[Optional["CancelToken"]] = ContextVar("cancel_token", default=None)
+
+
+class Cancelled(BaseException):
+    """
+    Raised in graph nodes and provider calls once their request was cancelled.
+    Like asyncio.CancelledError it is not an Exception, so nodes that turn
+    provider errors into warnings don't swallow it.
+    """
+
+    def __init__(self, reason: str):
+        super().__init__(f"Request cancelled ({reason})")
+        self.reason = reason
+
+
+class CancelToken:
+    """
+    Cancellation flag of one request, with an optional deadline. The request
+    handler cancels it (client disconnected); graph nodes and provider streams
+    running in worker threads check it between steps and chunks.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+
+    def cancel(self, reason: str):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+        CANCELLED.labels(reason=reason).inc()
+        logger.info(f"Cancelling request work: {reason}")
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._event.is_set() and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel("deadline")
+        return self._event.is_set()
+
+    def check(self):
+        if self.cancelled:
+            raise Cancelled(self.reason)
+
+
+def cancel_config(token: CancelToken, **configurable: Any) -> RunnableConfig:
+    """Graph run config that hands the token to every node"""
+    return {"configurable": {**configurable, CONFIG_KEY: token}}
+
+
+def current_token() -> Optional[CancelToken]:
+    return _current_token.get()
+
+
+def check_cancelled():
+    """Raise Cancelled if the request of the running node was cancelled"""
+    token = _current_token.get()
+    if token is not None:
+        token.check()
+
+
+def cancellable(fn: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Callable:
+    """
+    Wrap a graph node so it does not start once its request was cancelled and
+    provider calls inside it can find the token through current_token().
+    """
+    def wrapper(state: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+        token = (config.get("configurable") or {}).get(CONFIG_KEY)
+        if token is None:
+            return fn(state)
+        token.check()
+        reset = _current_token.set(token)
+        try:
+            return fn(state)
+        finally:
+            _current_token.reset(reset)
+
+    wrapper.__name__ = getattr(fn, "__name__", "node")
+    return wrapper
+
+
+def iter_cancellable(chunks: Iterable[Any], token: Optional[CancelToken] = None) -> Iterator[Any]:
+    """
+    Pass a provider stream through, stopping between chunks once the request
+    is cancelled. The stream is closed when iteration ends early, which closes
+    its HTTP response so the provider stops generating.
+    """
+    token = token or _current_token.get()
+    iterator = iter(chunks)
+    try:
+        for chunk in iterator:
+            if token is not None:
+                token.check()
+            yield chunk
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,81 @@
+import re
+from typing import Dict, List, Tuple
+
+# A blog section starts at a level-2 heading; text before the first one is the introduction
+_SECTION_START = re.compile(r"(?m)^(?=## )")
+_HEADING = re.compile(r"(?m)^## ")
+
+# Markup kept out of translation segments: heading marks, bullets, list numbers, quotes
+_SEGMENT_LINE = re.compile(r"^(\s*(?:#{1,6}\s+|[-*+]\s+|\d+[.)]\s+|>\s*)*)(.*?)(\s*)$")
+_SEGMENT_MARKER = re.compile(r"<<<SEG (\d+)>>>[ \t]*\n?(.*?)(?=<<<SEG \d+>>>|\Z)", re.S)
+
+# (line index, markup prefix, text to translate, trailing whitespace)
+Segment = Tuple[int, str, str, str]
+
+
+def split_sections(markdown: str) -> List[str]:
+    """Split Markdown at `## ` headings. Joining the parts gives back the input unchanged."""
+    return [part for part in _SECTION_START.split(markdown or "") if part]
+
+
+def join_sections(sections: List[str]) -> str:
+    return "".join(sections)
+
+
+def heading(section: str) -> str:
+    """Heading text of a section, or "Introduction" for the text before the first heading"""
+    first_line = section.lstrip().split("\n", 1)[0]
+    return first_line[3:].strip() if first_line.startswith("## ") else "Introduction"
+
+
+def word_count(section: str) -> int:
+    return len(section.split())
+
+
+def normalize_section(text: str, original: str, last: bool) -> str:
+    """
+    Make a rewritten or translated section fit back in place: it keeps the
+    original's heading if the model dropped it, never opens further `## `
+    sections (which would shift every index after it), and ends with a blank
+    line unless it is the last section.
+    """
+    text = text.strip()
+    if original.lstrip().startswith("## ") and not text.startswith("## "):
+        text = original.lstrip().split("\n", 1)[0] + "\n\n" + text
+    first, sep, rest = text.partition("\n")
+    text = first + sep + _HEADING.sub("### ", rest)
+    return text + "\n" if last else text + "\n\n"
+
+
+def split_segments(markdown: str) -> List[Segment]:
+    """Translatable segments of Markdown: one per line with text, outside code blocks"""
+    segments = []
+    in_code = False
+    for index, line in enumerate(markdown.split("\n")):
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+            continue
+        if in_code:
+            continue
+        prefix, text, suffix = _SEGMENT_LINE.match(line).groups()
+        if any(char.isalpha() for char in text):
+            segments.append((index, prefix, text, suffix))
+    return segments
+
+
+def replace_segments(markdown: str, segments: List[Segment], translations: Dict[str, str]) -> str:
+    """Put translated segment texts back into the Markdown they were split from"""
+    lines = markdown.split("\n")
+    for index, prefix, text, suffix in segments:
+        lines[index] = prefix + translations[text] + suffix
+    return "\n".join(lines)
+
+
+def format_segments(texts: List[str]) -> str:
+    """Number segments with `<<<SEG n>>>` marker lines (from 1) for a single LLM request"""
+    return "\n".join(f"<<<SEG {number}>>>\n{text}" for number, text in enumerate(texts, 1))
+
+
+def parse_segments(reply: str) -> Dict[int, str]:
+    """Segment number -> text from a reply that kept the markers; each text on a single line"""
+    return {int(number): " ".join(text.split()) for number, text in _SEGMENT_MARKER.findall(reply)}
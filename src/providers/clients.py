@@ -0,0 +1,71 @@
+import os
+import logging
+from functools import lru_cache
+from typing import Any, Dict
+
+from src.llms.groqllm import GroqLLM
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Voice/audio SDKs (elevenlabs, assemblyai, pydub) are imported on first use so
+# text-only workers and the LangGraph dev server never pay for them.
+
+# Stand-in providers registered by benchmarks/harnesses; empty in production
+_overrides: Dict[str, Any] = {}
+
+
+def override_providers(llm=None, stt=None, tts=None):
+    """Replace the real LLM / speech-to-text / text-to-speech clients process-wide."""
+    for name, client in (("llm", llm), ("stt", stt), ("tts", tts)):
+        if client is not None:
+            _overrides[name] = client
+            logger.info(f"Using stand-in {name} provider: {type(client).__name__}")
+
+
+@lru_cache(maxsize=1)
+def _groq():
+    return GroqLLM().get_llm()
+
+
+def get_llm():
+    """Chat model used by the graph nodes, shared by all requests of the process"""
+    if "llm" in _overrides:
+        return _overrides["llm"]
+    return _groq()
+
+
+@lru_cache(maxsize=1)
+def _assemblyai():
+    import assemblyai as aai
+    aai.settings.api_key = os.getenv("ASSEMBLYAI_API_KEY")
+    return aai
+
+
+def get_stt_client():
+    """Speech-to-text client exposing `Transcriber().transcribe(path)`"""
+    return _overrides.get("stt") or _assemblyai()
+
+
+@lru_cache(maxsize=1)
+def _elevenlabs():
+    from elevenlabs.client import ElevenLabs
+    return ElevenLabs(api_key=os.getenv("ELEVENLABS_API_KEY"))
+
+
+def get_tts_client():
+    """Text-to-speech client exposing `text_to_speech.convert(...)`"""
+    return _overrides.get("tts") or _elevenlabs()
+
+
+@lru_cache(maxsize=1)
+def get_audio_segment():
+    """pydub's AudioSegment class, configured with the ffmpeg binary"""
+    from pydub import AudioSegment
+
+    # Configure audio converter path (FFMPEG_PATH overrides the Windows default)
+    ffmpeg_path = os.getenv("FFMPEG_PATH", "C:\\ffmpeg\\bin\\ffmpeg.exe")
+    if os.path.exists(ffmpeg_path):
+        AudioSegment.converter = ffmpeg_path
+    return AudioSegment
@@ -2,7 +2,6 @@ from typing import TypedDict, Optional, Dict, Any, List, Union
 from pydantic import BaseModel, Field, validator
 from enum import Enum
 import os
-from pydub import AudioSegment
 from pathlib import Path
 import logging
 
@@ -10,9 +9,6 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configure audio converter path
-AudioSegment.converter = "C:\\ffmpeg\\bin\\ffmpeg.exe"  # replace path if different
-
 class Language(str, Enum):
     """Supported languages for blog generation and translation"""
     ENGLISH = "english"
@@ -61,7 +57,9 @@ class BlogContent(BaseModel):
 class BlogState(TypedDict, total=False):
     """
     Enhanced state container for blog generation workflow with type-safe fields.
-    Now supports both file-based and streaming audio output.
+    Binary payloads (uploads, synthesized audio) stay out of the state: it holds
+    file paths and artifact-store references, so steps and checkpoints copy
+    only small values.
     """
     # Core fields
     topic: Optional[str]
@@ -69,12 +67,24 @@ class BlogState(TypedDict, total=False):
     language: Optional[Language]
     current_language: Optional[Language]
     voice_preference: Optional[VoicePreference]  # New field
+    tone: Optional[str]                     # Writing tone requested by the client
+    length: Optional[int]                   # Target word count
+    source_content: Optional[str]           # Draft from content_generation, before translation
+
+    # Revisions of a stored blog (one entry per `## ` section)
+    source_sections: Optional[List[str]]    # Draft sections
+    sections: Optional[List[str]]           # Published (translated) sections
+    revise_sections: Optional[List[int]]    # Indices of the sections to regenerate
+    revision_instructions: Optional[str]    # Editor's instructions for those sections
+    translate: Optional[bool]               # Whether the stored blog went through translation
     
     # Voice processing pipeline
     voice_input_path: Optional[Path]        # Path to input audio file
+    voice_input_sha256: Optional[str]       # Hash of the uploaded audio bytes
     voice_transcript: Optional[str]         # Raw transcription text
     voice_output_url: Optional[str]         # URL to generated audio file
-    voice_output_stream: Optional[bytes]    # Streaming audio bytes
+    voice_output_audio: Optional[Dict[str, Any]]  # Artifact-store reference (sha256, bytes) of the audio
+    synthesize_audio: Optional[bool]        # Run voice_output in the graph (default True)
     
     # System fields
     error: Optional[str]                   # Error message
@@ -83,6 +93,8 @@ class BlogState(TypedDict, total=False):
     
     # Metadata
     processing_time: Optional[float]       # Time taken in seconds
+    node_timings: Optional[Dict[str, float]]  # Seconds spent in each node
+    token_usage: Optional[Dict[str, int]]  # LLM input/output tokens
     source: Optional[str]                  # Source of the content
     api_used: Optional[str]                # Which TTS API was used
 
@@ -101,8 +113,9 @@ def validate_audio_path(path: Optional[Union[str, Path]]) -> Optional[Path]:
             raise FileNotFoundError(f"Audio file not found: {p}")
         
         # Verify file is actually audio
+        from src.providers.clients import get_audio_segment
         try:
-            AudioSegment.from_file(p).duration_seconds > 0
+            get_audio_segment().from_file(p).duration_seconds > 0
         except Exception as e:
             raise ValueError(f"Invalid audio file: {str(e)}")
         
@@ -0,0 +1,224 @@
+import os
+import re
+import gzip
+import json
+import time
+import uuid
+import hashlib
+import logging
+import tempfile
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import brotli
+except ImportError:  # optional; without it only gzip variants are written
+    brotli = None
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Outside the publicly mounted static/ directory: blobs are served only through /blogs/{id}
+ARTIFACT_STORE_DIR = os.getenv("ARTIFACT_STORE_DIR") or os.path.join(".cache", "artifacts")
+
+# Blogs are compressed once and read many times, so use the slowest, smallest settings
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# Content-Encoding -> file suffix of the precompressed variant
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+_BLOG_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class BlobWriter:
+    """
+    A blob written chunk by chunk, e.g. audio as it is synthesized, so it is
+    never held in memory whole. commit() moves it into place under its sha256;
+    leaving the `with` block without committing discards it.
+    """
+
+    def __init__(self, store: "ArtifactStore"):
+        self.store = store
+        self._hash = hashlib.sha256()
+        self.bytes = 0
+        fd, self._tmp_path = tempfile.mkstemp(dir=store.blob_dir, suffix=".tmp")
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, data: bytes):
+        self._hash.update(data)
+        self._file.write(data)
+        self.bytes += len(data)
+
+    def commit(self) -> Dict[str, Any]:
+        self._file.close()
+        sha256 = self._hash.hexdigest()
+        path = self.store.blob_path(sha256)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(self._tmp_path, path)
+        return {"sha256": sha256, "bytes": self.bytes, "encodings": []}
+
+    def discard(self):
+        self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def __enter__(self) -> "BlobWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.discard()
+
+
+class ArtifactStore:
+    """
+    Generated blogs on disk. Payloads (markdown, audio) are content-addressed
+    blobs under `blobs/`, with gzip/brotli variants of text written next to
+    them; `blogs/<id>.json` records reference blobs by sha256. All files are
+    written atomically, so several worker processes can share the directory.
+    """
+
+    def __init__(self, root: str = ARTIFACT_STORE_DIR):
+        self.root = root
+        self.blob_dir = os.path.join(root, "blobs")
+        self.blog_dir = os.path.join(root, "blogs")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.blog_dir, exist_ok=True)
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    @staticmethod
+    def valid_id(blog_id: str) -> bool:
+        return bool(_BLOG_ID.match(blog_id))
+
+    def _write(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def blob_path(self, sha256: str, encoding: Optional[str] = None) -> str:
+        return os.path.join(self.blob_dir, sha256[:2], sha256 + ENCODING_SUFFIXES.get(encoding, ""))
+
+    def put_blob(self, data: bytes, compress: bool = False) -> Dict[str, Any]:
+        """Store bytes under their sha256 (once) and return the reference kept in blog records"""
+        sha256 = hashlib.sha256(data).hexdigest()
+        encodings: List[str] = []
+        if compress:
+            encodings.append("gzip")
+            if brotli is not None:
+                encodings.insert(0, "br")
+
+        if not os.path.exists(self.blob_path(sha256)):
+            for encoding in encodings:
+                if encoding == "br":
+                    compressed = brotli.compress(data, quality=BROTLI_QUALITY, mode=brotli.MODE_TEXT)
+                else:
+                    compressed = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+                self._write(self.blob_path(sha256, encoding), compressed)
+            # The plain blob goes last: its presence means every variant exists
+            self._write(self.blob_path(sha256), data)
+        return {"sha256": sha256, "bytes": len(data), "encodings": encodings}
+
+    def open_blob(self) -> BlobWriter:
+        return BlobWriter(self)
+
+    def put_stream(self, chunks: Iterable[bytes]) -> Dict[str, Any]:
+        """Store a blob from an iterable of chunks without joining them in memory"""
+        with self.open_blob() as blob:
+            for chunk in chunks:
+                blob.write(chunk)
+            return blob.commit()
+
+    def read_blob(self, sha256: str) -> bytes:
+        with open(self.blob_path(sha256), "rb") as f:
+            return f.read()
+
+    def _blog_path(self, blog_id: str) -> str:
+        return os.path.join(self.blog_dir, f"{blog_id}.json")
+
+    def save_blog(self, record: Dict[str, Any]) -> str:
+        record.setdefault("id", self.new_id())
+        record.setdefault("created", time.time())
+        payload = json.dumps(record, ensure_ascii=False, indent=2).encode("utf-8")
+        self._write(self._blog_path(record["id"]), payload)
+        return record["id"]
+
+    def get_blog(self, blog_id: str) -> Optional[Dict[str, Any]]:
+        if not self.valid_id(blog_id):
+            return None
+        try:
+            with open(self._blog_path(blog_id), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable blog record {blog_id}: {e}")
+            return None
+
+    def update_blog(self, blog_id: str, **fields) -> Optional[Dict[str, Any]]:
+        record = self.get_blog(blog_id)
+        if record is None:
+            return None
+        record.update(fields)
+        self.save_blog(record)
+        return record
+
+
+@lru_cache(maxsize=1)
+def get_artifact_store() -> ArtifactStore:
+    """Process-wide artifact store"""
+    return ArtifactStore()
+
+
+def etag(artifact: Dict[str, Any], encoding: Optional[str] = None) -> str:
+    """Strong ETag of one representation (identity or a precompressed variant) of a blob"""
+    return f'"{artifact["sha256"]}-{encoding}"' if encoding else f'"{artifact["sha256"]}"'
+
+
+def etag_matches(if_none_match: Optional[str], artifact: Dict[str, Any]) -> bool:
+    """True when If-None-Match names any representation of the blob (or is `*`)"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag.strip('"').split("-")[0] == artifact["sha256"]:
+            return True
+    return False
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available: List[str]) -> Optional[str]:
+    """Best precompressed variant the client accepts; `available` is in order of preference"""
+    accepted: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.partition(";")
+        name, params = name.strip().lower(), params.strip()
+        if not name:
+            continue
+        quality = 1.0
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
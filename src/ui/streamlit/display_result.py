@@ -1,6 +1,5 @@
 # src/ui/streamlit/display_result.py
 import streamlit as st
-import requests
 from io import BytesIO
 
 def show_blog_result(result_data):
@@ -22,7 +21,7 @@ def show_blog_result(result_data):
         st.markdown("---")
         st.subheader("🔊 Audio Version")
         
-        if 'voice_url' in result_data:  # Traditional file-based approach
+        if 'voice_url' in result_data:  # Streamed by the browser straight from the backend
             st.audio(result_data['voice_url'], format='audio/mp3')
         elif 'audio_stream' in result_data:  # New streaming approach
             audio_bytes = result_data['audio_stream']
@@ -38,14 +37,13 @@ def show_blog_result(result_data):
             file_name="generated_blog.md",
             mime="text/markdown"
         )
+        if 'blog_url' in result_data:
+            # Served from the backend's artifact store; opening it again does not regenerate
+            st.link_button("Open Stored Blog", result_data['blog_url'])
     with col2:
         if 'voice_url' in result_data:
-            st.download_button(
-                label="Download Audio",
-                data=requests.get(result_data['voice_url']).content,
-                file_name="blog_audio.mp3",
-                mime="audio/mp3"
-            )
+            # A link, so the page doesn't block on fetching the whole MP3 before rendering
+            st.link_button("Download Audio", result_data['voice_url'])
         elif 'audio_stream' in result_data:
             st.download_button(
                 label="Download Audio",
@@ -1,17 +1,23 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 from io import BytesIO
 from audio_recorder_streamlit import audio_recorder
 from src.ui.streamlit.display_result import show_blog_result
-from elevenlabs.client import ElevenLabs
 import base64
+import json
+import os
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-API_URL = "http://localhost:8000/blogs"
+API_BASE = os.getenv("BLOG_API_URL", "http://localhost:8000")
+API_URL = f"{API_BASE}/blogs"
+
+# (connect, read) timeouts; the read timeout applies between streamed events, not to the whole blog
+STREAM_TIMEOUT = (5, 120)
 
 LANGUAGES = {
     "English": "english",
@@ -29,6 +35,61 @@ VOICE_MAPPING = {
     "german": "Elli"
 }
 
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Pooled keep-alive session shared by all reruns and browser sessions"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def consume_blog_stream(response: requests.Response):
+    """Render NDJSON events from the backend as they arrive and return the final result"""
+    status = st.empty()
+    live = st.empty()
+    title, content, node = "", "", None
+
+    def render_live():
+        with live.container():
+            if title:
+                st.markdown(f"### {title}")
+            st.markdown(content)
+
+    for line in response.iter_lines(decode_unicode=True):
+        if not line:
+            continue
+        event = json.loads(line)
+        kind = event.get("type")
+
+        if kind == "transcript":
+            status.info(f"🎙️ Heard: {event['text']}")
+        elif kind == "title":
+            title = event["text"]
+            status.info("✍️ Writing...")
+            render_live()
+        elif kind == "token":
+            # A translation replaces the draft it is translating
+            if event["node"] != node:
+                node, content = event["node"], ""
+                if node.endswith("_translation"):
+                    status.info("🌐 Translating...")
+            content += event["text"]
+            render_live()
+        elif kind == "content":
+            content = event["text"]
+            render_live()
+        elif kind == "error":
+            status.empty()
+            live.empty()
+            raise RuntimeError(event.get("details") or event.get("error", "Unknown backend error"))
+        elif kind == "done":
+            status.empty()
+            live.empty()
+            return event
+
+    raise RuntimeError("Connection closed before the blog was complete")
+
 def render_input_ui():
     st.title("🎤📝 AI Blog Generator")
     st.markdown("---")
@@ -93,62 +154,42 @@ def render_input_ui():
                 type="primary",
                 disabled=(input_type == "Voice" and not audio_bytes)):
         
-        with st.spinner("Generating your blog..."):
-            try:
-                # Text Input Processing
-                if input_type == "Text":
-                    payload = {
-                        "input_type": "text",
-                        "output_type": output_format.lower(),
-                        "text_input": text_input.strip(),
-                        "language": LANGUAGES[language],
-                        "tone": tone.lower(),
-                        "length": str(length)
-                    }
-                    response = requests.post(API_URL, data=payload, timeout=60)
-
-                # Voice Input Processing
-                else:
-                    audio_file = BytesIO(audio_bytes)
-                    response = requests.post(
-                        API_URL,
-                        files={"voice_input": ("voice_input.wav", audio_file, "audio/wav")},
-                        data={
-                            "input_type": "voice",
-                            "output_type": output_format.lower(),
-                            "language": LANGUAGES[language],
-                            "tone": tone.lower(),
-                            "length": str(length),
-                            "audio_size": str(len(audio_bytes))
-                        },
-                        timeout=90  # Longer timeout for voice processing
-                    )
+        try:
+            session = get_http_session()
+            data = {
+                "input_type": input_type.lower(),
+                "output_type": output_format.lower(),
+                "language": LANGUAGES[language],
+                "tone": tone.lower(),
+                "length": str(length),
+                "stream": "true"
+            }
+            files = None
+
+            # Text Input Processing
+            if input_type == "Text":
+                data["text_input"] = text_input.strip()
+
+            # Voice Input Processing
+            else:
+                files = {"voice_input": ("voice_input.wav", BytesIO(audio_bytes), "audio/wav")}
+                data["audio_size"] = str(len(audio_bytes))
 
+            with session.post(API_URL, data=data, files=files, stream=True, timeout=STREAM_TIMEOUT) as response:
                 # Handle Response
                 if response.status_code == 200:
-                    result = response.json()
-                    
-                    # Voice Output Handling
-                    if output_format.lower() == "voice":
-                        if 'audio_stream' not in result:
-                            st.error("🔇 Voice generation failed - no audio returned")
-                            logger.error(f"Backend response missing audio: {result}")
-                            return None
-                        
-                        audio_bytes = result['audio_stream']
-                        show_blog_result({
-                            "title": result.get("title", ""),
-                            "content": result.get("content", ""),
-                            "language": result.get("language", "english"),
-                            "audio_stream": audio_bytes
-                        })
-                        
-                        # Auto-play and show audio controls
-                        st.audio(audio_bytes, format="audio/mp3", start_time=0)
-                        
-                    # Text Output Handling
-                    else:
-                        show_blog_result(result)
+                    result = consume_blog_stream(response)
+                    if result.get("url"):
+                        result["blog_url"] = f"{API_BASE}{result['url']}"
+
+                    # Voice Output Handling: the browser streams the MP3 straight from the backend
+                    if result.get("audio_url"):
+                        result["voice_url"] = f"{API_BASE}{result['audio_url']}"
+                    elif output_format.lower() == "voice":
+                        st.error("🔇 Voice generation failed - no audio returned")
+                        logger.error(f"Backend response missing audio: {result}")
+
+                    show_blog_result(result)
 
                 else:
                     error_data = response.json()
@@ -160,11 +201,11 @@ def render_input_ui():
                         st.info("💡 Try: 1) Louder speaking 2) Closer to mic 3) Less background noise")
                     logger.error(f"Backend error: {error_data}")
 
-            except requests.exceptions.RequestException as e:
-                st.error(f"🌐 Network Error: Failed to connect to server")
-                logger.error(f"Request failed: {str(e)}")
-            except Exception as e:
-                st.error(f"⚡ Unexpected Error: {str(e)}")
-                logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+        except requests.exceptions.RequestException as e:
+            st.error(f"🌐 Network Error: Failed to connect to server")
+            logger.error(f"Request failed: {str(e)}")
+        except Exception as e:
+            st.error(f"⚡ Unexpected Error: {str(e)}")
+            logger.error(f"Unexpected error: {str(e)}", exc_info=True)
 
     return None
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+End-to-end checks of the blog and revision endpoints through FastAPI's
+TestClient, with the stand-in providers from `benchmarks/fakes.py`.
+
+    python -m pytest -q tests
+"""
+import importlib
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.fakes import FakeChatModel, FakeSTT, FakeTTS, make_wav
+from src.providers.clients import override_providers
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    # The stores read their locations when app.py is imported, so point them at a scratch dir first
+    workdir = tmp_path_factory.mktemp("app")
+    settings = {
+        "ARTIFACT_STORE_DIR": str(workdir / "artifacts"),
+        "SHARED_STORE_PATH": str(workdir / "shared.sqlite3"),
+        "TRANSCRIPT_CACHE_DIR": str(workdir / "transcripts"),
+        "TRANSLATION_MEMORY_PATH": str(workdir / "translation_memory.sqlite3"),
+        "RATE_LIMIT_PER_MINUTE": "0",
+    }
+    previous = {key: os.environ.get(key) for key in settings}
+    os.environ.update(settings)
+    override_providers(llm=FakeChatModel(output_words=300), stt=FakeSTT(), tts=FakeTTS(bytes_per_char=10))
+
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        for name in ("src.storage.artifact_store", "src.cache.shared_store", "src.cache.transcript_cache",
+                     "src.cache.translation_memory"):
+            if name in sys.modules:
+                importlib.reload(sys.modules[name])
+        app = importlib.reload(sys.modules["app"]) if "app" in sys.modules else importlib.import_module("app")
+        with TestClient(app.app) as test_client:
+            yield test_client
+    finally:
+        os.chdir(cwd)
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+@pytest.fixture(scope="module")
+def french_blog(client):
+    response = client.post("/blogs", data={
+        "input_type": "text", "output_type": "text", "text_input": "Agentic AI", "language": "french"
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_create_blog_stores_sections(client, french_blog):
+    metadata = client.get(f"/blogs/{french_blog['id']}/metadata").json()
+    assert metadata["language"] == "french"
+    assert len(metadata["source_sections"]) > 1
+    assert len(metadata["sections"]) == len(metadata["source_sections"])
+
+
+def test_unknown_media_type_is_rejected(client):
+    response = client.post("/blogs", data={"input_type": "video", "output_type": "text", "text_input": "x"})
+    assert response.status_code == 400
+
+
+def test_voice_upload(client, tmp_path):
+    path = make_wav(str(tmp_path / "topic.wav"), seconds=1.0)
+    with open(path, "rb") as f:
+        response = client.post("/blogs", data={"input_type": "voice", "output_type": "text"},
+                               files={"voice_input": ("topic.wav", f, "audio/wav")})
+    assert response.status_code == 200, response.text
+
+
+def test_invalid_voice_upload_is_rejected(client):
+    response = client.post("/blogs", data={"input_type": "voice", "output_type": "text"},
+                           files={"voice_input": ("topic.wav", b"not audio", "audio/wav")})
+    assert response.status_code == 400
+
+
+def test_revise_one_section(client, french_blog):
+    original = client.get(f"/blogs/{french_blog['id']}/metadata").json()
+
+    response = client.post(f"/blogs/{french_blog['id']}/revisions", data={"section": 1, "instructions": "Shorter"})
+    assert response.status_code == 200, response.text
+    revision = response.json()
+    assert revision["revision_of"] == french_blog["id"]
+    assert revision["revised_sections"] == [1]
+
+    revised = client.get(f"/blogs/{revision['id']}/metadata").json()
+    assert revised["revision_of"] == french_blog["id"]
+    # Untouched sections keep their stored text
+    for index, (before, after) in enumerate(zip(original["sections"], revised["sections"])):
+        if index != 1:
+            assert before["content"]["sha256"] == after["content"]["sha256"]
+
+
+def test_revision_rejects_out_of_range_section(client, french_blog):
+    response = client.post(f"/blogs/{french_blog['id']}/revisions", data={"section": 99})
+    assert response.status_code == 400
+
+
+def test_revision_of_unknown_blog(client):
+    response = client.post("/blogs/does-not-exist/revisions", data={"section": 0})
+    assert response.status_code == 404